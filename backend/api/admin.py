@@ -27,7 +27,7 @@ class TagAdmin(ImportExportModelAdmin):
 
 
 class RecipeAdmin(admin.ModelAdmin):
-    list_display = ('name', 'author')
+    list_display = ('name', 'author', 'favorites_count', 'short_link_hits')
     list_display_links = ('name', 'author')
     search_fields = ('name', 'author')
     list_filter = ('tags',)
@@ -37,9 +37,10 @@ class ShoppingCartAdmin(admin.ModelAdmin):
     list_display = ('user', 'recipe', 'get_recipe_count')
     list_display_links = ('user', 'recipe')
     list_filter = ('user',)
+    list_select_related = ('user', 'recipe')
 
     def get_recipe_count(self, obj):
-        return obj.user.shoppingcart.count()
+        return obj.user.shopping_cart_count
     get_recipe_count.short_description = 'Количество рецептов'
 
 
@@ -0,0 +1,139 @@
+"""Сравнение способов чтения рецептов на одном наборе данных.
+
+Одни и те же страницы списка и рецепты запрашиваются через ORM и
+RecipeReadSerializer, через словари api.fast_read и через документы
+PostgreSQL api.db_documents. Ответы каждого способа сверяются с ответами
+ORM после разбора JSON.
+
+bytes_per_response — размер тела ответа как есть. JSON из PostgreSQL
+содержит пробелы и переводы строк между элементами (см. api.db_documents),
+поэтому для сравнения объема данных есть compact_bytes_per_response —
+размер того же документа в компактной записи, как у JSONRenderer.
+"""
+import json
+import time
+
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .load import Fixtures, percentile
+
+BACKENDS = {
+    'orm': {},
+    'fast_read': {'RECIPE_FAST_READ': True},
+    'db_documents': {'RECIPE_DB_DOCUMENTS': True},
+}
+LIST_PAGES = 5
+
+
+def compact_json(document):
+    """Документ в компактной записи JSONRenderer (bytes)."""
+
+    return json.dumps(
+        document, ensure_ascii=False, separators=(',', ':')
+    ).encode()
+
+
+def build_plan(fixtures, rng, requests, limit):
+    """Запросы замера: (эндпоинт, путь), поровну список и рецепт."""
+
+    plan = []
+    for number in range(requests):
+        if number % 2:
+            plan.append(('recipe_detail',
+                         f'/api/recipes/{rng.choice(fixtures.recipe_ids)}/'))
+        else:
+            page = rng.randint(1, LIST_PAGES)
+            plan.append(('recipe_list',
+                         f'/api/recipes/?limit={limit}&page={page}'))
+    return plan
+
+
+def is_fallback(backend):
+    return backend == 'db_documents' and connection.vendor != 'postgresql'
+
+
+class BackendRunner:
+    """Прогон плана запросов для каждого способа чтения."""
+
+    def __init__(self, plan, token, warmup=10):
+        self.plan = plan
+        self.warmup = warmup
+        self.client = Client(
+            HTTP_HOST='localhost', HTTP_AUTHORIZATION=f'Token {token}'
+        )
+        self.reference = None
+
+    def send(self, path):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = self.client.get(path)
+            elapsed = time.perf_counter() - started
+        return response, elapsed, len(queries)
+
+    def run_backend(self, backend):
+        flags = {'RECIPE_FAST_READ': False, 'RECIPE_DB_DOCUMENTS': False}
+        samples = {}
+        documents = []
+        with override_settings(**{**flags, **BACKENDS[backend]}):
+            for _, path in self.plan[:self.warmup]:
+                self.send(path)
+            for endpoint, path in self.plan:
+                response, elapsed, queries = self.send(path)
+                document = json.loads(response.content)
+                samples.setdefault(endpoint, []).append((
+                    elapsed, queries, len(response.content),
+                    len(compact_json(document))
+                ))
+                documents.append(document)
+        if self.reference is None:
+            self.reference = documents
+        mismatches = sum(
+            document != reference
+            for document, reference in zip(documents, self.reference)
+        )
+        return {
+            'fallback': is_fallback(backend),
+            'mismatches': mismatches,
+            'endpoints': {
+                endpoint: self.stats(endpoint_samples)
+                for endpoint, endpoint_samples in sorted(samples.items())
+            },
+        }
+
+    @staticmethod
+    def stats(samples):
+        latencies = sorted(elapsed * 1000 for elapsed, *_ in samples)
+        return {
+            'count': len(samples),
+            'p50_ms': round(percentile(latencies, 0.50), 2),
+            'p95_ms': round(percentile(latencies, 0.95), 2),
+            'mean_ms': round(sum(latencies) / len(latencies), 2),
+            'queries_per_request': round(
+                sum(queries for _, queries, *_ in samples) / len(samples), 2
+            ),
+            'bytes_per_response': round(
+                sum(size for _, _, size, _ in samples) / len(samples)
+            ),
+            'compact_bytes_per_response': round(
+                sum(compact for *_, compact in samples) / len(samples)
+            ),
+        }
+
+
+def run(rng, requests=200, limit=6, backends=None, warmup=10):
+    """Результаты по способам чтения; первым всегда идет orm."""
+
+    fixtures = Fixtures(rng)
+    plan = build_plan(fixtures, rng, requests, limit)
+    runner = BackendRunner(plan, fixtures.tokens[0], warmup)
+    names = ['orm'] + [
+        name for name in (backends or BACKENDS) if name != 'orm'
+    ]
+    return {
+        'vendor': connection.vendor,
+        'requests': requests,
+        'limit': limit,
+        'backends': {name: runner.run_backend(name) for name in names},
+    }
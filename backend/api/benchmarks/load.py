@@ -0,0 +1,361 @@
+"""Нагрузочный прогон API по взвешенным сценариям.
+
+Запросы отправляются либо в приложение внутри процесса через тестовый
+клиент Django, либо по HTTP (например, в gunicorn). Результат — задержки
+p50/p95/p99, пропускная способность и число SQL-запросов на запрос по
+каждому эндпоинту.
+"""
+import json
+import math
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+from api.models import Ingredient, Recipe, Tag
+from api.seeding import SEED_USERNAME_PREFIX
+
+User = get_user_model()
+
+SCENARIO_WEIGHTS = {
+    'recipe_list': 30,
+    'recipe_list_tags': 10,
+    'recipe_list_favorited': 5,
+    'recipe_detail': 15,
+    'ingredient_search': 15,
+    'favorite_toggle': 5,
+    'cart_toggle': 5,
+    'subscriptions': 10,
+    'download_shopping_cart': 5,
+}
+SAMPLE_SIZE = 1000
+SAMPLE_USERS = 50
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+class Fixtures:
+    """Случайные, но воспроизводимые данные для построения запросов."""
+
+    def __init__(self, rng):
+        self.recipe_ids = self.sample(rng, Recipe.objects.values_list(
+            'id', flat=True
+        ))
+        self.tags = list(Tag.objects.order_by('id').values_list(
+            'slug', flat=True
+        ))
+        self.prefixes = sorted({
+            name[:rng.randint(1, 3)] for name in self.sample(
+                rng, Ingredient.objects.values_list('name', flat=True)
+            )
+        })
+        # Токены создаются только синтетическим пользователям seed_scale,
+        # чтобы замер на рабочей базе не выдал токены настоящим.
+        users = list(User.objects.filter(
+            is_active=True, is_staff=False, is_superuser=False,
+            username__startswith=SEED_USERNAME_PREFIX
+        ).order_by('-recipes_count', 'id')[:SAMPLE_USERS])
+        self.tokens = [
+            Token.objects.get_or_create(user=user)[0].key for user in users
+        ]
+        if not (self.recipe_ids and self.tags and self.tokens):
+            raise ValueError(
+                'В базе нет рецептов, тегов или пользователей seed_scale, '
+                'заполните ее командой seed_scale.'
+            )
+
+    @staticmethod
+    def sample(rng, values):
+        values = list(values.order_by('pk'))
+        return rng.sample(values, min(len(values), SAMPLE_SIZE))
+
+
+class Scenarios:
+    """Построение запросов сценария: (эндпоинт, метод, путь, токен)."""
+
+    def __init__(self, fixtures, rng):
+        self.fixtures = fixtures
+        self.rng = rng
+
+    def build(self, name):
+        return getattr(self, name)()
+
+    def recipe(self):
+        return self.rng.choice(self.fixtures.recipe_ids)
+
+    def token(self):
+        return self.rng.choice(self.fixtures.tokens)
+
+    def recipe_list(self):
+        page = self.rng.randint(1, 5)
+        return [('recipe_list', 'GET',
+                 f'/api/recipes/?limit=6&page={page}', None)]
+
+    def recipe_list_tags(self):
+        tags = self.rng.sample(
+            self.fixtures.tags, min(2, len(self.fixtures.tags))
+        )
+        query = '&'.join(f'tags={tag}' for tag in tags)
+        return [('recipe_list_tags', 'GET',
+                 f'/api/recipes/?limit=6&{query}', None)]
+
+    def recipe_list_favorited(self):
+        return [('recipe_list_favorited', 'GET',
+                 '/api/recipes/?limit=6&is_favorited=1', self.token())]
+
+    def recipe_detail(self):
+        return [('recipe_detail', 'GET',
+                 f'/api/recipes/{self.recipe()}/', self.token())]
+
+    def ingredient_search(self):
+        prefix = self.rng.choice(self.fixtures.prefixes)
+        return [('ingredient_search', 'GET',
+                 f'/api/ingredients/?name={urllib.parse.quote(prefix)}',
+                 None)]
+
+    def toggle(self, name, url_path):
+        path = f'/api/recipes/{self.recipe()}/{url_path}/'
+        token = self.token()
+        # Удаление выполняется, только если добавление прошло успешно,
+        # поэтому существующие данные пользователей не меняются.
+        return [(f'{name}_add', 'POST', path, token),
+                (f'{name}_remove', 'DELETE', path, token)]
+
+    def favorite_toggle(self):
+        return self.toggle('favorite', 'favorite')
+
+    def cart_toggle(self):
+        return self.toggle('cart', 'shopping_cart')
+
+    def subscriptions(self):
+        return [('subscriptions', 'GET',
+                 '/api/users/subscriptions/?recipes_limit=3', self.token())]
+
+    def download_shopping_cart(self):
+        file_format = self.rng.choice(('pdf', 'txt', 'csv'))
+        return [('download_shopping_cart', 'GET',
+                 f'/api/recipes/download_shopping_cart/?format={file_format}',
+                 self.token())]
+
+
+class InProcessTransport:
+    """Запросы через тестовый клиент; SQL считается по соединению."""
+
+    name = 'in-process'
+
+    def __init__(self):
+        self.client = Client(HTTP_HOST='localhost')
+
+    def send(self, method, path, token):
+        headers = {'HTTP_AUTHORIZATION': f'Token {token}'} if token else {}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.generic(method, path, **headers)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        return response.status_code, len(queries)
+
+
+class HTTPTransport:
+    """Запросы по HTTP; SQL берется из заголовка Server-Timing."""
+
+    def __init__(self, base_url):
+        self.name = base_url
+        self.base_url = base_url.rstrip('/')
+
+    def send(self, method, path, token):
+        request = urllib.request.Request(
+            self.base_url + path, method=method,
+            headers={'Authorization': f'Token {token}'} if token else {}
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                status, headers = response.status, response.headers
+        except urllib.error.HTTPError as error:
+            error.read()
+            status, headers = error.code, error.headers
+        match = SERVER_TIMING_QUERIES.search(
+            headers.get('Server-Timing', '')
+        )
+        return status, int(match.group(1)) if match else None
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def gunicorn_server(workers, timeout=30):
+    """Локальный gunicorn с включенным REQUEST_PROFILING."""
+
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'backend.wsgi:application',
+         '--bind', f'127.0.0.1:{port}', '--workers', str(workers)],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, 'REQUEST_PROFILING': 'True'},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                socket.create_connection(('127.0.0.1', port), 1).close()
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(
+                        'Не удалось запустить gunicorn, запустите его '
+                        'вручную и передайте адрес через --url.'
+                    )
+                time.sleep(0.2)
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def percentile(values, share):
+    """Перцентиль методом ближайшего ранга по отсортированному списку."""
+
+    index = max(math.ceil(share * len(values)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+class LoadRunner:
+    """Прогон сценариев и сбор статистики по эндпоинтам."""
+
+    def __init__(self, transport, scenarios, weights, concurrency=1):
+        self.transport = transport
+        self.scenarios = scenarios
+        self.names = list(weights)
+        self.weights = list(weights.values())
+        self.concurrency = concurrency
+        self.samples = defaultdict(list)
+
+    def run_scenario(self, name, seed):
+        # Свой генератор на каждый сценарий: общий self.scenarios.rng из
+        # нескольких потоков давал бы разные запросы при одном --seed.
+        scenarios = Scenarios(self.scenarios.fixtures, random.Random(seed))
+        results = []
+        for endpoint, method, path, token in scenarios.build(name):
+            started = time.perf_counter()
+            status, queries = self.transport.send(method, path, token)
+            results.append((endpoint, time.perf_counter() - started,
+                            status, queries))
+            if method == 'POST' and status != 201:
+                break
+        return results
+
+    def run(self, requests, warmup=0):
+        rng = self.scenarios.rng
+        names = rng.choices(self.names, weights=self.weights,
+                            k=warmup + requests)
+        base_seed = rng.getrandbits(32)
+        plan = [
+            (name, base_seed + index) for index, name in enumerate(names)
+        ]
+        for name, seed in plan[:warmup]:
+            self.run_scenario(name, seed)
+        started = time.perf_counter()
+        if self.concurrency > 1:
+            with ThreadPoolExecutor(self.concurrency) as executor:
+                batches = list(executor.map(
+                    lambda item: self.run_scenario(*item), plan[warmup:]
+                ))
+        else:
+            batches = [
+                self.run_scenario(name, seed) for name, seed in plan[warmup:]
+            ]
+        duration = time.perf_counter() - started
+        for batch in batches:
+            for endpoint, elapsed, status, queries in batch:
+                self.samples[endpoint].append((elapsed, status, queries))
+        return self.report(duration)
+
+    def report(self, duration):
+        endpoints = {}
+        total = 0
+        errors = 0
+        for endpoint, samples in sorted(self.samples.items()):
+            latencies = sorted(elapsed * 1000 for elapsed, _, _ in samples)
+            queries = [count for _, _, count in samples if count is not None]
+            statuses = Counter(status for _, status, _ in samples)
+            endpoint_errors = sum(
+                count for status, count in statuses.items() if status >= 400
+            )
+            endpoints[endpoint] = {
+                'count': len(samples),
+                'errors': endpoint_errors,
+                'statuses': {
+                    str(status): count for status, count in statuses.items()
+                },
+                'p50_ms': round(percentile(latencies, 0.50), 2),
+                'p95_ms': round(percentile(latencies, 0.95), 2),
+                'p99_ms': round(percentile(latencies, 0.99), 2),
+                'mean_ms': round(sum(latencies) / len(latencies), 2),
+                'queries_per_request': (
+                    round(sum(queries) / len(queries), 2) if queries else None
+                ),
+            }
+            total += len(samples)
+            errors += endpoint_errors
+        return {
+            'target': self.transport.name,
+            'concurrency': self.concurrency,
+            'duration_s': round(duration, 3),
+            'requests': total,
+            'errors': errors,
+            'throughput_rps': round(total / max(duration, 1e-9), 1),
+            'endpoints': endpoints,
+        }
+
+
+def compare(result, baseline):
+    """Строки сравнения с базовым прогоном: изменение в процентах."""
+
+    def change(new, old):
+        if not old or new is None:
+            return 'n/a'
+        return f'{(new - old) / old * 100:+.1f}%'
+
+    lines = [
+        f'throughput: {baseline["throughput_rps"]} -> '
+        f'{result["throughput_rps"]} rps '
+        f'({change(result["throughput_rps"], baseline["throughput_rps"])})'
+    ]
+    for endpoint, stats in result['endpoints'].items():
+        old = baseline['endpoints'].get(endpoint)
+        if old is None:
+            lines.append(f'{endpoint}: нет в базовом прогоне')
+            continue
+        lines.append(
+            f'{endpoint}: ' + ', '.join(
+                f'{metric} {change(stats[metric], old[metric])}'
+                for metric in ('p50_ms', 'p95_ms', 'p99_ms',
+                               'queries_per_request')
+            )
+        )
+    return lines
+
+
+def save(result, path):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(result, file, ensure_ascii=False, indent=2)
@@ -0,0 +1,254 @@
+"""Микробенчмарк сериализаторов на заранее собранных объектах.
+
+Объекты создаются в памяти вместе с аннотациями и кешем prefetch_related,
+как их отдает RecipeQuerySet.for_read, поэтому сериализация не обращается
+к базе данных и замер показывает только работу сериализаторов.
+"""
+import gc
+import hashlib
+import random
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.fast_read import RecipeDocuments
+from api.models import Ingredient, Recipe, RecipeIngredient, Tag
+from api.serializers import IngredientSerializer, RecipeReadSerializer
+from users.models import Follow
+from users.serializers import SubscribeSerializer, UserSerializer
+
+User = get_user_model()
+
+SIZES = (6, 50, 500)
+MIN_INGREDIENTS = 5
+MAX_INGREDIENTS = 40
+PREVIEW_RECIPES = 3
+
+
+def file_name(directory, number):
+    digest = hashlib.sha256(str(number).encode()).hexdigest()
+    return f'{directory}/{digest[:2]}/{digest[2:4]}/{digest}.webp'
+
+
+def prefetched(instance, cache_name, model, objects):
+    """Заполнение кеша prefetch_related без запроса к базе данных."""
+
+    queryset = model.objects.all()
+    queryset._result_cache = list(objects)
+    queryset._prefetch_done = True
+    if not hasattr(instance, '_prefetched_objects_cache'):
+        instance._prefetched_objects_cache = {}
+    instance._prefetched_objects_cache[cache_name] = queryset
+
+
+class ObjectGraph:
+    """Рецепты, авторы, теги и ингредиенты, собранные в памяти."""
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        self.tags = [
+            Tag(pk=number, name=f'Тег {number}', slug=f'tag{number}')
+            for number in range(1, 11)
+        ]
+        self.ingredients = [
+            Ingredient(pk=number, name=f'ингредиент {number}',
+                       measurement_unit='г')
+            for number in range(1, 1001)
+        ]
+
+    def user(self, pk):
+        user = User(
+            pk=pk, username=f'user{pk}', email=f'user{pk}@example.com',
+            first_name='Имя', last_name=f'Фамилия {pk}',
+            avatar=file_name('user_images', pk), recipes_count=10
+        )
+        user.is_subscribed = self.rng.random() < 0.3
+        return user
+
+    def recipe(self, pk, author):
+        recipe = Recipe(
+            pk=pk, author=author, name=f'Рецепт {pk}',
+            text='Описание рецепта. ' * 20,
+            image=file_name('recipe_images', pk),
+            cooking_time=self.rng.randint(5, 180)
+        )
+        recipe.is_favorited = self.rng.random() < 0.2
+        recipe.is_in_shopping_cart = self.rng.random() < 0.1
+        prefetched(recipe, 'tags', Tag, self.rng.sample(self.tags, 2))
+        count = self.rng.randint(MIN_INGREDIENTS, MAX_INGREDIENTS)
+        prefetched(recipe, 'recipeingredient_set', RecipeIngredient, [
+            RecipeIngredient(
+                pk=pk * 100 + number, recipe=recipe, ingredient=ingredient,
+                amount=self.rng.randint(1, 500)
+            )
+            for number, ingredient in enumerate(
+                self.rng.sample(self.ingredients, count)
+            )
+        ])
+        return recipe
+
+    def recipes(self, size):
+        authors = [self.user(pk) for pk in range(1, size // 5 + 2)]
+        return [self.recipe(pk, self.rng.choice(authors))
+                for pk in range(1, size + 1)]
+
+    def users(self, size):
+        return [self.user(pk) for pk in range(1, size + 1)]
+
+    def subscriptions(self, size, reader):
+        follows = []
+        previews = {}
+        for pk in range(1, size + 1):
+            author = self.user(pk + 1)
+            follows.append(Follow(pk=pk, user=reader, author=author))
+            previews[author.pk] = [
+                self.recipe(pk * PREVIEW_RECIPES + number, author)
+                for number in range(PREVIEW_RECIPES)
+            ]
+        return follows, previews
+
+
+def recipe_rows(recipes):
+    """Данные для RecipeDocuments в виде, как их отдает values()."""
+
+    rows = []
+    tags = {}
+    ingredients = {}
+    authors = {}
+    for recipe in recipes:
+        author = recipe.author
+        rows.append({
+            'id': recipe.pk, 'name': recipe.name, 'image': recipe.image.name,
+            'text': recipe.text, 'cooking_time': recipe.cooking_time,
+            'created_at': None, 'is_favorited': recipe.is_favorited,
+            'is_in_shopping_cart': recipe.is_in_shopping_cart,
+            'author_id': author.pk,
+        })
+        authors[author.pk] = {
+            'id': author.pk, 'username': author.username,
+            'email': author.email, 'is_subscribed': author.is_subscribed,
+            'first_name': author.first_name, 'last_name': author.last_name,
+            'avatar': author.avatar.name,
+        }
+        tags[recipe.pk] = [
+            {'id': tag.pk, 'name': tag.name, 'slug': tag.slug}
+            for tag in recipe.tags.all()
+        ]
+        ingredients[recipe.pk] = [
+            {'id': item.ingredient.pk, 'name': item.ingredient.name,
+             'measurement_unit': item.ingredient.measurement_unit,
+             'amount': item.amount}
+            for item in recipe.recipeingredient_set.all()
+        ]
+    return rows, tags, ingredients, list(authors.values())
+
+
+def build_documents(documents, rows, tags, ingredients, authors):
+    """Работа RecipeDocuments после запросов к базе данных."""
+
+    return documents.build(rows, tags, ingredients, {
+        author['id']: documents.author(author) for author in authors
+    })
+
+
+def make_request(user):
+    request = Request(APIRequestFactory().get(
+        '/api/recipes/', {'recipes_limit': PREVIEW_RECIPES},
+        HTTP_HOST='localhost'
+    ))
+    request.user = user
+    return request
+
+
+def build_cases(size, seed=0):
+    """Сериализаторы и данные для одного размера: имя -> функция."""
+
+    graph = ObjectGraph(seed)
+    reader = graph.user(0)
+    request = make_request(reader)
+    context = {'request': request}
+    recipes = graph.recipes(size)
+    users = graph.users(size)
+    ingredients = graph.ingredients[:size]
+    follows, previews = graph.subscriptions(size, reader)
+    documents = RecipeDocuments(request)
+    rows = recipe_rows(recipes)
+    return {
+        'RecipeReadSerializer': lambda: RecipeReadSerializer(
+            recipes, many=True, context=context
+        ).data,
+        'RecipeDocuments': lambda: build_documents(documents, *rows),
+        'UserSerializer': lambda: UserSerializer(
+            users, many=True, context=context
+        ).data,
+        'SubscribeSerializer': lambda: SubscribeSerializer(
+            follows, many=True,
+            context={**context, 'recipe_previews': previews}
+        ).data,
+        'IngredientSerializer': lambda: IngredientSerializer(
+            ingredients, many=True
+        ).data,
+    }
+
+
+@contextmanager
+def database_blocked():
+    def blocker(*args):
+        raise RuntimeError('Сериализатор обратился к базе данных.')
+
+    with connection.execute_wrapper(blocker):
+        yield
+
+
+def measure(serialize, repeat):
+    """Время (медиана и минимум) и память на один объект.
+
+    Делитель — число реально сериализованных объектов: набора
+    ингредиентов может не хватить на запрошенный размер.
+    """
+
+    size = max(len(serialize()), 1)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        serialize()
+        timings.append(time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        result = serialize()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(
+        stat.count_diff for stat in after.compare_to(before, 'filename')
+    )
+    del result
+    return {
+        'objects': size,
+        'median_us_per_object': round(
+            statistics.median(timings) / size * 1e6, 2
+        ),
+        'min_us_per_object': round(min(timings) / size * 1e6, 2),
+        'peak_bytes_per_object': round(peak / size),
+        'blocks_per_object': round(blocks / size, 1),
+    }
+
+
+def run(sizes=SIZES, repeat=20, seed=0, names=None):
+    results = {}
+    with database_blocked():
+        for size in sizes:
+            for name, serialize in build_cases(size, seed).items():
+                if names and name not in names:
+                    continue
+                results[f'{name}[{size}]'] = measure(serialize, repeat)
+    return results
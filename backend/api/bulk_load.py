@@ -0,0 +1,199 @@
+import csv
+import json
+import os
+import tempfile
+from itertools import islice
+
+from django.db import connection, transaction
+
+from .models import Ingredient, Tag
+from .reference_data import invalidate_reference_data
+
+# Справочные модели: загружаемые поля и поля ограничения уникальности.
+REFERENCE_MODELS = {
+    'ingredients': (Ingredient, ('name', 'measurement_unit'),
+                    ('name', 'measurement_unit')),
+    'tags': (Tag, ('name', 'slug'), ('slug',)),
+}
+JSON_CHUNK_SIZE = 64 * 1024
+COPY_BUFFER_SIZE = 16 * 1024 * 1024
+
+
+def iter_csv(file):
+    yield from csv.DictReader(file)
+
+
+def iter_ndjson(file):
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_json(file):
+    """Потоковый разбор JSON-массива объектов без чтения файла целиком."""
+
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != '[':
+                    raise ValueError('Ожидается JSON-массив объектов.')
+                started = True
+                position += 1
+                continue
+            if buffer[position] == ']':
+                return
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                pass
+            else:
+                yield item
+                continue
+        chunk = file.read(JSON_CHUNK_SIZE)
+        if not chunk:
+            if position < len(buffer) or started:
+                raise ValueError('Файл JSON обрывается на середине.')
+            return
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+READERS = {
+    '.csv': iter_csv,
+    '.json': iter_json,
+    '.ndjson': iter_ndjson,
+    '.jsonl': iter_ndjson,
+}
+
+
+def model_for_path(path):
+    """Справочник по имени файла: ingredients.csv -> ингредиенты."""
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if stem not in REFERENCE_MODELS:
+        raise ValueError(
+            f'Не удалось определить справочник для {path}, '
+            f'укажите один из: {", ".join(REFERENCE_MODELS)}.'
+        )
+    return stem
+
+
+def clean_rows(rows, model, fields, key_fields, stats):
+    """Нормализация строк и отбрасывание дубликатов по ключу.
+
+    Пустые значения и значения длиннее поля модели пропускаются.
+    """
+
+    limits = {
+        field: model._meta.get_field(field).max_length for field in fields
+    }
+    seen = set()
+    for row in rows:
+        stats['rows'] += 1
+        values = {
+            field: str(row.get(field) or '').strip() for field in fields
+        }
+        if not all(values.values()) or any(
+            len(values[field]) > limits[field] for field in fields
+        ):
+            stats['invalid'] += 1
+            continue
+        key = tuple(values[field] for field in key_fields)
+        if key in seen:
+            stats['duplicates'] += 1
+            continue
+        seen.add(key)
+        yield values
+
+
+def batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def bulk_insert(model, rows, batch_size):
+    for batch in batches(rows, batch_size):
+        model.objects.bulk_create(
+            [model(**values) for values in batch],
+            batch_size=batch_size, ignore_conflicts=True
+        )
+
+
+def copy_insert(model, fields, key_fields, rows):
+    """Загрузка через COPY во временную таблицу и слияние (PostgreSQL)."""
+
+    if connection.vendor != 'postgresql':
+        raise ValueError('COPY поддерживается только в PostgreSQL.')
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = ', '.join(
+        connection.ops.quote_name(model._meta.get_field(field).column)
+        for field in fields
+    )
+    keys = ', '.join(
+        connection.ops.quote_name(model._meta.get_field(field).column)
+        for field in key_fields
+    )
+    with tempfile.SpooledTemporaryFile(
+        max_size=COPY_BUFFER_SIZE, mode='w+', newline=''
+    ) as buffer, connection.cursor() as cursor:
+        writer = csv.writer(buffer)
+        for values in rows:
+            writer.writerow([values[field] for field in fields])
+        buffer.seek(0)
+        # ON COMMIT DROP не сработает между вызовами внутри одной внешней
+        # транзакции (atomic в тестах или другой команде), поэтому таблица
+        # удаляется и до создания, и после слияния.
+        cursor.execute('DROP TABLE IF EXISTS reference_staging')
+        cursor.execute(
+            f'CREATE TEMP TABLE reference_staging ON COMMIT DROP AS '
+            f'SELECT {columns} FROM {table} WITH NO DATA'
+        )
+        cursor.cursor.copy_expert(
+            f'COPY reference_staging ({columns}) FROM STDIN WITH CSV',
+            buffer
+        )
+        cursor.execute(
+            f'INSERT INTO {table} ({columns}) '
+            f'SELECT DISTINCT ON ({keys}) {columns} FROM reference_staging '
+            f'ON CONFLICT DO NOTHING'
+        )
+        cursor.execute('DROP TABLE reference_staging')
+
+
+def load_reference_data(path, name=None, batch_size=1000, use_copy=False):
+    """Загрузка справочника из CSV, JSON или NDJSON.
+
+    Повторная загрузка того же файла ничего не меняет: существующие
+    записи пропускаются по ограничению уникальности.
+    """
+
+    name = name or model_for_path(path)
+    model, fields, key_fields = REFERENCE_MODELS[name]
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in READERS:
+        raise ValueError(f'Неподдерживаемый формат файла: {extension}')
+    stats = dict.fromkeys(('rows', 'invalid', 'duplicates', 'created'), 0)
+    with open(path, encoding='utf-8', newline='') as file:
+        rows = clean_rows(
+            READERS[extension](file), model, fields, key_fields, stats
+        )
+        with transaction.atomic():
+            before = model.objects.count()
+            if use_copy:
+                copy_insert(model, fields, key_fields, rows)
+            else:
+                bulk_insert(model, rows, batch_size)
+            stats['created'] = model.objects.count() - before
+    if stats['created']:
+        invalidate_reference_data(model)
+    return model, stats
@@ -0,0 +1,41 @@
+from uuid import uuid4
+
+from django.core.cache import caches
+from django.db import transaction
+
+
+def get_version(cache_alias, key):
+    """Текущая версия данных, хранящаяся в кеше.
+
+    Версия — случайный токен, а не счетчик, поэтому вытеснение ключа из
+    кеша не может вернуть старое значение и сделать устаревшие данные
+    снова актуальными.
+    """
+
+    cache = caches[cache_alias]
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_versions(cache_alias, keys):
+    """Смена версий: все данные, собранные по старым версиям, устаревают.
+
+    Версии меняются сразу и еще раз после коммита транзакции, иначе
+    параллельный запрос успел бы сохранить в кеше данные до коммита под
+    уже новой версией.
+    """
+
+    keys = list(keys)
+    if not keys:
+        return
+
+    def bump():
+        caches[cache_alias].set_many(
+            {key: uuid4().hex for key in keys}, None
+        )
+
+    bump()
+    transaction.on_commit(bump)
@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Favorite, Recipe, ShoppingCart
+from users.models import Follow
+
+User = get_user_model()
+
+# (модель со счетчиком, поле счетчика, подсчитываемая модель, ее FK).
+COUNTERS = [
+    (Recipe, 'favorites_count', Favorite, 'recipe'),
+    (Recipe, 'shopping_cart_count', ShoppingCart, 'recipe'),
+    (User, 'recipes_count', Recipe, 'author'),
+    (User, 'followers_count', Follow, 'author'),
+    (User, 'following_count', Follow, 'user'),
+    (User, 'shopping_cart_count', ShoppingCart, 'user'),
+]
+COUNTED_MODELS = {source for _, _, source, _ in COUNTERS}
+
+
+def update_counters(instance, delta):
+    """Атомарное изменение счетчиков, связанных с объектом, на delta."""
+
+    for model, field, source, foreign_key in COUNTERS:
+        if isinstance(instance, source):
+            model.objects.filter(
+                pk=getattr(instance, f'{foreign_key}_id')
+            ).update(**{field: Greatest(F(field) + delta, 0)})
+
+
+def actual_count(source, foreign_key):
+    """Подзапрос с фактическим числом связанных объектов."""
+
+    return Coalesce(Subquery(
+        source.objects.filter(
+            **{foreign_key: OuterRef('pk')}
+        ).order_by().values(foreign_key).annotate(
+            count=Count('pk')
+        ).values('count')
+    ), Value(0))
+
+
+def find_drift(model, field, source, foreign_key):
+    """Количество объектов, у которых счетчик расходится с данными."""
+
+    return model.objects.annotate(
+        actual=actual_count(source, foreign_key)
+    ).exclude(**{field: F('actual')}).count()
+
+
+def rebuild_counter(model, field, source, foreign_key):
+    """Пересчет счетчика одним UPDATE, возвращает число строк."""
+
+    return model.objects.update(**{field: actual_count(source, foreign_key)})
@@ -0,0 +1,198 @@
+"""Быстрое чтение списка рецептов без сериализаторов DRF.
+
+Рецепты, авторы, теги и ингредиенты выбираются через values(), документы
+ответа собираются из словарей напрямую. Результат совпадает
+с RecipeReadSerializer байт в байт (см. api.tests.test_fast_read).
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .images import IMAGE_VARIANTS, variant_name
+from .models import Recipe, RecipeIngredient, Tag, with_subscription_flag
+from .renderers import FastJSONRenderer
+
+User = get_user_model()
+
+RECIPE_FIELDS = (
+    'id', 'name', 'image', 'text', 'cooking_time', 'created_at',
+    'is_favorited', 'is_in_shopping_cart', 'author_id',
+)
+AUTHOR_FIELDS = (
+    'id', 'username', 'email', 'is_subscribed', 'first_name', 'last_name',
+    'avatar',
+)
+
+
+def recipe_rows(queryset):
+    """Кверисет словарей рецептов.
+
+    queryset должен содержать аннотации RecipeQuerySet.with_user_flags;
+    created_at нужен курсорной пагинации. Авторы выбираются отдельным
+    запросом: JOIN в этом кверисете попал бы и в COUNT(*) пагинатора.
+    """
+
+    fields = list(RECIPE_FIELDS)
+    if 'search_snippet' in queryset.query.annotations:
+        fields.append('search_snippet')
+    return queryset.prefetch_related(None).values(*fields)
+
+
+def absolute_url_builder(request):
+    """Аналог request.build_absolute_uri для путей медиафайлов.
+
+    Схема и хост вычисляются один раз на запрос.
+    """
+
+    prefix = request.build_absolute_uri('/')[:-1]
+
+    def build(url):
+        if url.startswith('/') and not url.startswith('//'):
+            return prefix + url
+        return request.build_absolute_uri(url)
+
+    return build
+
+
+class RecipeDocuments:
+    """Сборка документов рецептов в формате RecipeReadSerializer."""
+
+    def __init__(self, request):
+        self.user = request.user
+        self.anonymous = request.user.is_anonymous
+        self.absolute_url = absolute_url_builder(request)
+        self.recipe_storage = Recipe._meta.get_field('image').storage
+        self.avatar_storage = User._meta.get_field('avatar').storage
+
+    def __call__(self, rows):
+        rows = list(rows)
+        return self.build(rows, *self.fetch(rows))
+
+    def fetch(self, rows):
+        """Теги, ингредиенты и авторы рецептов.
+
+        Запросы повторяют запросы prefetch_related из
+        RecipeQuerySet.for_read вместе с их order_by, поэтому порядок
+        элементов тот же.
+        Теги и ингредиенты — {id рецепта: [словари]}, авторы —
+        {id автора: документ автора}.
+        """
+
+        tags = {}
+        ingredients = {}
+        if not rows:
+            return tags, ingredients, {}
+        recipe_ids = [row['id'] for row in rows]
+        for recipe_id, pk, name, slug in Tag.objects.filter(
+            recipes__in=recipe_ids
+        ).order_by('id').values_list('recipes__id', 'id', 'name', 'slug'):
+            tags.setdefault(recipe_id, []).append(
+                {'id': pk, 'name': name, 'slug': slug}
+            )
+        recipe_ingredients = RecipeIngredient.objects.filter(
+            recipe__in=recipe_ids
+        ).order_by('id').values_list(
+            'recipe_id', 'ingredient_id', 'ingredient__name',
+            'ingredient__measurement_unit', 'amount'
+        )
+        for recipe_id, pk, name, unit, amount in recipe_ingredients:
+            ingredients.setdefault(recipe_id, []).append({
+                'id': pk, 'name': name, 'measurement_unit': unit,
+                'amount': amount
+            })
+        authors = with_subscription_flag(
+            User.objects.filter(pk__in={row['author_id'] for row in rows}),
+            self.user
+        ).values(*AUTHOR_FIELDS)
+        return tags, ingredients, {
+            author['id']: self.author(author) for author in authors
+        }
+
+    def image(self, storage, name):
+        if not name:
+            return None, None
+        return self.absolute_url(storage.url(name)), {
+            variant: self.absolute_url(
+                storage.url(variant_name(name, variant))
+            )
+            for variant in IMAGE_VARIANTS
+        }
+
+    def author(self, row):
+        avatar, avatar_variants = self.image(
+            self.avatar_storage, row['avatar']
+        )
+        return {
+            'id': row['id'],
+            'username': row['username'],
+            'email': row['email'],
+            'is_subscribed': False if self.anonymous else row['is_subscribed'],
+            'first_name': row['first_name'],
+            'last_name': row['last_name'],
+            'avatar': avatar,
+            'avatar_variants': avatar_variants,
+        }
+
+    def build(self, rows, tags, ingredients, authors):
+        documents = []
+        for row in rows:
+            image, image_variants = self.image(
+                self.recipe_storage, row['image']
+            )
+            document = {
+                'id': row['id'],
+                'tags': tags.get(row['id'], []),
+                'author': authors[row['author_id']],
+                'ingredients': ingredients.get(row['id'], []),
+                'is_favorited': (
+                    False if self.anonymous else row['is_favorited']
+                ),
+                'is_in_shopping_cart': (
+                    False if self.anonymous else row['is_in_shopping_cart']
+                ),
+                'name': row['name'],
+                'image': image,
+                'image_variants': image_variants,
+                'text': row['text'],
+                'cooking_time': row['cooking_time'],
+            }
+            if row.get('search_snippet') is not None:
+                document['search_snippet'] = row['search_snippet']
+            documents.append(document)
+        return documents
+
+
+class FastReadMixin:
+    """Список рецептов через RecipeDocuments и FastJSONRenderer.
+
+    Включается настройкой, имя которой задает fast_read_setting вьюсета;
+    при выключенной настройке работает обычный путь через сериализатор.
+    """
+
+    fast_read_setting = None
+
+    def use_fast_read(self):
+        return bool(self.fast_read_setting
+                    and getattr(settings, self.fast_read_setting, False))
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if not self.use_fast_read():
+            return renderers
+        return [
+            FastJSONRenderer() if type(renderer) is JSONRenderer else renderer
+            for renderer in renderers
+        ]
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_read():
+            return super().list(request, *args, **kwargs)
+        queryset = recipe_rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        documents = RecipeDocuments(request)(
+            queryset if page is None else page
+        )
+        if page is not None:
+            return self.get_paginated_response(documents)
+        return Response(documents)
@@ -0,0 +1,72 @@
+import base64
+import binascii
+
+from rest_framework import serializers
+
+from .images import (
+    IMAGE_VARIANTS,
+    ImageError,
+    MAX_IMAGE_BYTES,
+    process_upload,
+    variant_name
+)
+
+
+class Base64ImageField(serializers.ImageField):
+    """Базовый сериализатор для загрузки изображений.
+
+    Принимает data URI в base64 или файл, проверяет размер до
+    декодирования и сохраняет изображение перекодированным в WebP.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) and data.startswith('data:image'):
+            _, imgstr = data.split(';base64,')
+            if len(imgstr) * 3 // 4 > MAX_IMAGE_BYTES:
+                raise serializers.ValidationError(
+                    f'Размер файла превышает '
+                    f'{MAX_IMAGE_BYTES // 1024 // 1024} МБ.'
+                )
+            try:
+                raw = base64.b64decode(imgstr)
+            except (binascii.Error, ValueError):
+                self.fail('invalid_image')
+        elif hasattr(data, 'read'):
+            if data.size > MAX_IMAGE_BYTES:
+                raise serializers.ValidationError(
+                    f'Размер файла превышает '
+                    f'{MAX_IMAGE_BYTES // 1024 // 1024} МБ.'
+                )
+            raw = data.read()
+        else:
+            return super().to_internal_value(data)
+        try:
+            data = process_upload(raw)
+        except ImageError as error:
+            raise serializers.ValidationError(str(error))
+        return super().to_internal_value(data)
+
+
+class ImageVariantsField(serializers.Field):
+    """Ссылки на уменьшенные варианты изображения.
+
+    Загрузки через Base64ImageField сохраняются сразу с вариантами
+    (api.images.ImageUpload); файлам из других источников варианты
+    создает api.images.schedule_variants.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        request = self.context.get('request')
+        variants = {}
+        for variant in IMAGE_VARIANTS:
+            url = value.storage.url(variant_name(value.name, variant))
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            variants[variant] = url
+        return variants
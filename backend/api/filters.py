@@ -6,6 +6,7 @@ from django_filters.rest_framework import (
 )
 
 from .models import Ingredient, Recipe, Tag
+from .search import search_recipes
 
 
 class IngredientFilter(FilterSet):
@@ -18,6 +19,11 @@ class IngredientFilter(FilterSet):
 
 class RecipeFilter(FilterSet):
     name = CharFilter(field_name='name', lookup_expr='startswith')
+    search = CharFilter(
+        method='full_text_search',
+        label='Поиск',
+        help_text='Полнотекстовый поиск по названию и описанию.'
+    )
     tags = ModelMultipleChoiceFilter(
         queryset=Tag.objects.all(),
         field_name='tags__slug',
@@ -38,7 +44,7 @@ class RecipeFilter(FilterSet):
 
     class Meta:
         model = Recipe
-        fields = ['name', 'tags', 'author',
+        fields = ['name', 'search', 'tags', 'author',
                   'is_in_shopping_cart', 'is_favorited']
 
     def shopping_cart(self, queryset, name, value):
@@ -58,3 +64,6 @@ class RecipeFilter(FilterSet):
                 )
             return queryset.none()
         return queryset
+
+    def full_text_search(self, queryset, name, value):
+        return search_recipes(queryset, value)
@@ -0,0 +1,151 @@
+import io
+import logging
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from backend.constants import (
+    IMAGE_QUALITY,
+    IMAGE_VARIANTS,
+    MAX_IMAGE_BYTES,
+    MAX_IMAGE_PIXELS
+)
+
+logger = logging.getLogger(__name__)
+
+IMAGE_FORMAT, IMAGE_EXTENSION = (
+    ('WEBP', 'webp') if features.check('webp') else ('JPEG', 'jpg')
+)
+DERIVED_VARIANTS = [name for name in IMAGE_VARIANTS if name != 'full']
+
+# Порог Pillow совпадает с проектным. Вдвое больше порога Pillow
+# бросает DecompressionBombError, просто больше — предупреждает; такие
+# изображения отсекает проверка в open_image, предупреждение не нужно.
+Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+warnings.simplefilter('ignore', Image.DecompressionBombWarning)
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_WORKERS, thread_name_prefix='images'
+)
+
+
+class ImageError(ValueError):
+    """Изображение слишком большое или повреждено."""
+
+
+def open_image(raw):
+    """Открытие изображения с проверкой размеров до декодирования."""
+
+    if len(raw) > MAX_IMAGE_BYTES:
+        raise ImageError(
+            f'Размер файла превышает {MAX_IMAGE_BYTES // 1024 // 1024} МБ.'
+        )
+    try:
+        image = Image.open(io.BytesIO(raw))
+    except Image.DecompressionBombError:
+        raise ImageError(f'Изображение больше {MAX_IMAGE_PIXELS} пикселей.')
+    except (UnidentifiedImageError, OSError):
+        raise ImageError('Загрузите корректное изображение.')
+    width, height = image.size
+    if width * height > MAX_IMAGE_PIXELS:
+        raise ImageError(
+            f'Изображение больше {MAX_IMAGE_PIXELS} пикселей.'
+        )
+    return image
+
+
+def encode(image, size):
+    """Уменьшение до size и перекодирование в WebP (или JPEG)."""
+
+    image = image.copy()
+    image.thumbnail(size)
+    if IMAGE_FORMAT == 'JPEG' or image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGB')
+    output = io.BytesIO()
+    image.save(output, IMAGE_FORMAT, quality=IMAGE_QUALITY)
+    return output.getvalue()
+
+
+def prepare(raw):
+    """Полноразмерный вариант и словарь уменьшенных вариантов.
+
+    Изображение поворачивается по EXIF, метаданные не сохраняются.
+    """
+
+    image = ImageOps.exif_transpose(open_image(raw))
+    return encode(image, IMAGE_VARIANTS['full']), {
+        variant: encode(image, IMAGE_VARIANTS[variant])
+        for variant in DERIVED_VARIANTS
+    }
+
+
+class ImageUpload(ContentFile):
+    """Загруженное изображение вместе с уменьшенными вариантами.
+
+    ContentAddressedStorage сохраняет variants рядом с основным файлом,
+    поэтому ссылки на варианты в ответе на загрузку уже рабочие.
+    """
+
+    def __init__(self, content, variants, name=None):
+        super().__init__(content, name=name)
+        self.variants = variants
+
+
+def process_upload(raw):
+    """Нормализация загруженного изображения и его вариантов.
+
+    Запрос ждет результата, так что пул здесь только ограничивает число
+    одновременно декодируемых изображений (IMAGE_WORKERS) и не делает
+    загрузку асинхронной. Возвращает ImageUpload, готовый к сохранению
+    в ImageField.
+    """
+
+    content, variants = executor.submit(prepare, raw).result()
+    return ImageUpload(content, variants, name=f'image.{IMAGE_EXTENSION}')
+
+
+def variant_name(name, variant):
+    if variant == 'full':
+        return name
+    root, _ = os.path.splitext(name)
+    return f'{root}_{variant}.{IMAGE_EXTENSION}'
+
+
+def build_variants(name, storage=default_storage):
+    """Создание уменьшенных вариантов сохраненного изображения."""
+
+    try:
+        with storage.open(name) as file:
+            image = open_image(file.read())
+        for variant in DERIVED_VARIANTS:
+            target = variant_name(name, variant)
+            if not storage.exists(target):
+                storage.save(target, ContentFile(
+                    encode(image, IMAGE_VARIANTS[variant])
+                ))
+    except Exception:
+        logger.exception('Не удалось создать варианты %s', name)
+
+
+def storage_has_variants(name, storage=default_storage):
+    return all(
+        storage.exists(variant_name(name, variant))
+        for variant in DERIVED_VARIANTS
+    )
+
+
+def schedule_variants(name):
+    """Создание вариантов в пуле потоков после коммита транзакции.
+
+    Нужно для файлов, сохраненных не через process_upload (админка,
+    загрузка данных): у загрузок через API варианты уже есть.
+    """
+
+    if name and not storage_has_variants(name):
+        transaction.on_commit(lambda: executor.submit(build_variants, name))
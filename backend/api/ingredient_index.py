@@ -0,0 +1,65 @@
+import threading
+from bisect import bisect_left
+
+from .models import Ingredient
+from .reference_data import get_reference_version
+from backend.constants import INGREDIENT_SEARCH_LIMIT
+
+
+class IngredientIndex:
+    """Индекс ингредиентов в памяти процесса для поиска по началу названия.
+
+    Ингредиенты хранятся отсортированными по названию в нижнем регистре,
+    поэтому совпадения по началу находятся бинарным поиском. Индекс
+    перестраивается, когда меняется версия справочника, так что в обычном
+    режиме поиск не обращается к базе данных.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = (None, [], [])
+
+    def _current(self):
+        version = get_reference_version(Ingredient)
+        state = self._state
+        if state[0] != version:
+            with self._lock:
+                state = self._state
+                if state[0] != version:
+                    state = self._build(version)
+                    self._state = state
+        return state
+
+    @staticmethod
+    def _build(version):
+        items = sorted(
+            Ingredient.objects.values('id', 'name', 'measurement_unit'),
+            key=lambda item: (item['name'].lower(), item['id'])
+        )
+        keys = [item['name'].lower() for item in items]
+        return version, keys, items
+
+    def search(self, query, limit=INGREDIENT_SEARCH_LIMIT):
+        """Ингредиенты, название которых начинается с query или содержит его.
+
+        Совпадения по началу названия идут первыми.
+        """
+
+        _, keys, items = self._current()
+        query = query.lower()
+        result = []
+        start = bisect_left(keys, query)
+        end = start
+        while (end < len(keys) and len(result) < limit
+               and keys[end].startswith(query)):
+            result.append(items[end])
+            end += 1
+        for position, key in enumerate(keys):
+            if len(result) >= limit:
+                break
+            if query in key and not start <= position < end:
+                result.append(items[position])
+        return result
+
+
+ingredient_index = IngredientIndex()
@@ -0,0 +1,138 @@
+import json
+import random
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmarks.load import (
+    SCENARIO_WEIGHTS,
+    Fixtures,
+    HTTPTransport,
+    InProcessTransport,
+    LoadRunner,
+    Scenarios,
+    compare,
+    gunicorn_server,
+    save
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный прогон API по взвешенным сценариям: задержки '
+        'p50/p95/p99, пропускная способность и SQL-запросы по эндпоинтам. '
+        'Работает с текущей базой данных, заполнить ее можно командой '
+        'seed_scale.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=500,
+            help='Число сценариев в замере.'
+        )
+        parser.add_argument(
+            '--warmup', type=int, default=50,
+            help='Число сценариев для прогрева, в статистику не входят.'
+        )
+        target = parser.add_mutually_exclusive_group()
+        target.add_argument(
+            '--url', default=None,
+            help='Адрес запущенного сервера, например http://127.0.0.1:8000.'
+        )
+        target.add_argument(
+            '--gunicorn', type=int, default=None, metavar='WORKERS',
+            help='Запустить локальный gunicorn с указанным числом воркеров.'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=1,
+            help='Число параллельных клиентов (только для HTTP).'
+        )
+        parser.add_argument(
+            '--scenario', action='append', default=[],
+            metavar='NAME=WEIGHT',
+            help='Вес сценария; 0 отключает сценарий. '
+                 f'Сценарии: {", ".join(SCENARIO_WEIGHTS)}.'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Зерно генератора запросов.'
+        )
+        parser.add_argument(
+            '--output', default=None,
+            help='Файл для сохранения результата в JSON.'
+        )
+        parser.add_argument(
+            '--baseline', default=None,
+            help='JSON прошлого прогона для сравнения.'
+        )
+
+    def handle(self, *args, **options):
+        weights = self.parse_weights(options['scenario'])
+        if options['concurrency'] > 1 and not (
+            options['url'] or options['gunicorn']
+        ):
+            raise CommandError(
+                'Внутри процесса запросы идут последовательно, для '
+                '--concurrency укажите --url или --gunicorn.'
+            )
+        rng = random.Random(options['seed'])
+        try:
+            scenarios = Scenarios(Fixtures(rng), rng)
+        except ValueError as error:
+            raise CommandError(error)
+        server = (
+            gunicorn_server(options['gunicorn']) if options['gunicorn']
+            else nullcontext(options['url'])
+        )
+        try:
+            with server as url:
+                transport = (
+                    HTTPTransport(url) if url else InProcessTransport()
+                )
+                result = LoadRunner(
+                    transport, scenarios, weights, options['concurrency']
+                ).run(options['requests'], options['warmup'])
+        except RuntimeError as error:
+            raise CommandError(error)
+        self.print_result(result)
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as file:
+                baseline = json.load(file)
+            self.stdout.write('Сравнение с базовым прогоном:')
+            for line in compare(result, baseline):
+                self.stdout.write(f'  {line}')
+        if options['output']:
+            save(result, options['output'])
+            self.stdout.write(f'Результат сохранен в {options["output"]}')
+
+    @staticmethod
+    def parse_weights(overrides):
+        weights = dict(SCENARIO_WEIGHTS)
+        for override in overrides:
+            name, _, weight = override.partition('=')
+            if name not in weights or not weight.isdigit():
+                raise CommandError(f'Некорректный сценарий: {override}')
+            weights[name] = int(weight)
+        weights = {name: weight for name, weight in weights.items() if weight}
+        if not weights:
+            raise CommandError('Все сценарии отключены.')
+        return weights
+
+    def print_result(self, result):
+        self.stdout.write(
+            f'{result["target"]}: {result["requests"]} запросов за '
+            f'{result["duration_s"]} с, {result["throughput_rps"]} rps, '
+            f'ошибок {result["errors"]}'
+        )
+        self.stdout.write(
+            f'{"эндпоинт":<26}{"n":>6}{"p50":>9}{"p95":>9}{"p99":>9}'
+            f'{"SQL":>7}{"ошибки":>8}'
+        )
+        for endpoint, stats in result['endpoints'].items():
+            queries = stats['queries_per_request']
+            self.stdout.write(
+                f'{endpoint:<26}{stats["count"]:>6}{stats["p50_ms"]:>9}'
+                f'{stats["p95_ms"]:>9}{stats["p99_ms"]:>9}'
+                f'{"-" if queries is None else queries:>7}'
+                f'{stats["errors"]:>8}'
+            )
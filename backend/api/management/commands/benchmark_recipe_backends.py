@@ -0,0 +1,74 @@
+import json
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmarks.backends import BACKENDS, run
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнение способов чтения рецептов (ORM, api.fast_read, документы '
+        'PostgreSQL) на текущей базе данных: задержки, SQL-запросы и '
+        'совпадение ответов. Заполнить базу можно командой seed_scale.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=200,
+            help='Число запросов на каждый способ чтения.'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=6,
+            help='Размер страницы списка рецептов.'
+        )
+        parser.add_argument(
+            '--backend', action='append', choices=list(BACKENDS),
+            default=None, help='Сравнить с orm только указанные способы.'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Зерно генератора запросов.'
+        )
+        parser.add_argument(
+            '--output', default=None,
+            help='Файл для сохранения результата в JSON.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            result = run(
+                random.Random(options['seed']), options['requests'],
+                options['limit'], options['backend']
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        self.stdout.write(
+            f'{"способ":<14}{"эндпоинт":<15}{"p50":>9}{"p95":>9}'
+            f'{"среднее":>9}{"SQL":>6}{"байт":>9}{"компакт":>9}'
+        )
+        for backend, stats in result['backends'].items():
+            for endpoint, endpoint_stats in stats['endpoints'].items():
+                self.stdout.write(
+                    f'{backend:<14}{endpoint:<15}'
+                    f'{endpoint_stats["p50_ms"]:>9}'
+                    f'{endpoint_stats["p95_ms"]:>9}'
+                    f'{endpoint_stats["mean_ms"]:>9}'
+                    f'{endpoint_stats["queries_per_request"]:>6}'
+                    f'{endpoint_stats["bytes_per_response"]:>9}'
+                    f'{endpoint_stats["compact_bytes_per_response"]:>9}'
+                )
+            if stats['fallback']:
+                self.stdout.write(
+                    f'  {backend}: СУБД {result["vendor"]} не поддерживается, '
+                    f'использован путь через ORM'
+                )
+            if stats['mismatches']:
+                self.stdout.write(self.style.ERROR(
+                    f'  {backend}: {stats["mismatches"]} ответов '
+                    f'отличаются от orm'
+                ))
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(result, file, ensure_ascii=False, indent=2)
+            self.stdout.write(f'Результат сохранен в {options["output"]}')
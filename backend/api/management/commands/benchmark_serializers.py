@@ -0,0 +1,66 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from api.benchmarks.serializers import SIZES, run
+
+
+class Command(BaseCommand):
+    help = (
+        'Микробенчмарк сериализаторов рецептов, пользователей, подписок и '
+        'ингредиентов на объектах в памяти, без запросов к базе данных: '
+        'время и выделения памяти на один объект.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=list(SIZES),
+            help='Число объектов в одном вызове сериализатора.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Число повторов для замера времени.'
+        )
+        parser.add_argument(
+            '--serializer', action='append', default=None,
+            help='Замерить только указанные сериализаторы.'
+        )
+        parser.add_argument(
+            '--output', default=None,
+            help='Файл для сохранения результата в JSON.'
+        )
+        parser.add_argument(
+            '--baseline', default=None,
+            help='JSON прошлого прогона для сравнения.'
+        )
+
+    def handle(self, *args, **options):
+        results = run(
+            options['sizes'], options['repeat'], names=options['serializer']
+        )
+        baseline = {}
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as file:
+                baseline = json.load(file)
+        self.stdout.write(
+            f'{"сериализатор":<28}{"объектов":>10}{"мкс/объект":>12}'
+            f'{"мин":>10}{"байт/объект":>13}{"блоков":>9}{"изменение":>11}'
+        )
+        for case, stats in results.items():
+            change = ''
+            old = baseline.get(case)
+            if old:
+                ratio = (stats['median_us_per_object']
+                         / old['median_us_per_object'])
+                change = f'{(ratio - 1) * 100:+.1f}%'
+            self.stdout.write(
+                f'{case:<28}{stats["objects"]:>10}'
+                f'{stats["median_us_per_object"]:>12}'
+                f'{stats["min_us_per_object"]:>10}'
+                f'{stats["peak_bytes_per_object"]:>13}'
+                f'{stats["blocks_per_object"]:>9}{change:>11}'
+            )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(results, file, indent=2)
+            self.stdout.write(f'Результат сохранен в {options["output"]}')
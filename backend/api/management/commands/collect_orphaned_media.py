@@ -0,0 +1,217 @@
+import json
+import os
+import shutil
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.media import delete_file, iter_media_files, referenced_names
+from api.models import MediaFile
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаление файлов из MEDIA_ROOT, на которые не ссылается ни один '
+        'рецепт или пользователь, и записей MediaFile без ссылок. Обход '
+        'можно прерывать: он продолжится с последнего проверенного файла.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать файлы без ссылок, ничего не удаляя.'
+        )
+        parser.add_argument(
+            '--grace-hours',
+            type=float,
+            default=24,
+            help='Не трогать файлы моложе указанного числа часов.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Сколько файлов проверять в базе данных за один запрос.'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Проверить не больше указанного числа файлов за запуск.'
+        )
+        parser.add_argument(
+            '--quarantine',
+            default=None,
+            help='Переносить файлы в эту папку вместо удаления.'
+        )
+        parser.add_argument(
+            '--state-file',
+            default=None,
+            help='Файл с позицией обхода, по умолчанию '
+                 'MEDIA_ROOT/.orphaned_media.json.'
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Начать обход сначала, не учитывая сохраненную позицию.'
+        )
+
+    def handle(self, *args, **options):
+        self.root = settings.MEDIA_ROOT
+        if not os.path.isdir(self.root):
+            raise CommandError(f'Папка {self.root} не найдена.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        self.dry_run = options['dry_run']
+        self.quarantine = options['quarantine']
+        self.state_file = options['state_file'] or os.path.join(
+            self.root, '.orphaned_media.json'
+        )
+        self.stats = dict.fromkeys(
+            ('scanned', 'recent', 'kept', 'orphaned', 'bytes', 'queries',
+             'rows'), 0
+        )
+        after = () if options['restart'] else self.load_position()
+        if after:
+            self.stdout.write(f'Продолжение обхода после {"/".join(after)}')
+        exclude = set()
+        if self.quarantine:
+            exclude.add(os.path.abspath(self.quarantine))
+        self.cutoff = time.time() - options['grace_hours'] * 3600
+        limit = options['limit']
+        started = time.monotonic()
+        batch = []
+        last = None
+        finished = True
+        for parts, entry, source in iter_media_files(
+            self.root, after, exclude
+        ):
+            if limit is not None and self.stats['scanned'] >= limit:
+                finished = False
+                break
+            self.stats['scanned'] += 1
+            last = parts
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_mtime > self.cutoff:
+                self.stats['recent'] += 1
+                continue
+            batch.append(('/'.join(parts), source, stat.st_size))
+            if len(batch) >= options['batch_size']:
+                self.process(batch, last)
+                batch = []
+        self.process(batch, last)
+        if finished:
+            self.remove_unreferenced_rows()
+        if finished and not self.dry_run:
+            self.save_position(None)
+        self.report(time.monotonic() - started, finished)
+
+    def load_position(self):
+        try:
+            with open(self.state_file) as file:
+                return tuple(json.load(file)['last'].split('/'))
+        except FileNotFoundError:
+            return ()
+        except (ValueError, KeyError, AttributeError):
+            raise CommandError(
+                f'Поврежден файл {self.state_file}, запустите с --restart.'
+            )
+
+    def save_position(self, parts):
+        if parts is None:
+            if os.path.exists(self.state_file):
+                os.remove(self.state_file)
+            return
+        temp_path = f'{self.state_file}.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump({'last': '/'.join(parts)}, file)
+        os.replace(temp_path, self.state_file)
+
+    def process(self, batch, last):
+        if batch:
+            names = {name for name, _, _ in batch}
+            names.update(source for _, source, _ in batch if source)
+            referenced = referenced_names(names)
+            self.stats['queries'] += 1
+            for name, source, size in batch:
+                if name in referenced or source in referenced:
+                    self.stats['kept'] += 1
+                    continue
+                if self.dry_run:
+                    self.stdout.write(f'{name} ({size} байт)')
+                elif not self.remove(name):
+                    self.stats['recent'] += 1
+                    continue
+                self.stats['orphaned'] += 1
+                self.stats['bytes'] += size
+        if last is not None and not self.dry_run:
+            self.save_position(last)
+
+    def remove_unreferenced_rows(self):
+        """Записи MediaFile с нулем ссылок, оставшиеся без delete_file.
+
+        Так бывает, если процесс завершился до on_commit или файл был
+        сохранен, но ссылка на него не появилась. Файлы моложе срока
+        ожидания могут принадлежать незавершенной загрузке и не трогаются.
+        """
+
+        names = list(MediaFile.objects.filter(
+            references=0
+        ).values_list('name', flat=True))
+        self.stats['queries'] += 1
+        for name in names:
+            path = os.path.join(self.root, *name.split('/'))
+            try:
+                if os.stat(path).st_mtime > self.cutoff:
+                    continue
+            except FileNotFoundError:
+                pass
+            self.stats['rows'] += 1
+            if self.dry_run:
+                self.stdout.write(f'{name} (запись без ссылок)')
+            else:
+                delete_file(name)
+
+    def remove(self, name):
+        """Удаление файла; False, если его успели загрузить повторно."""
+
+        path = os.path.join(self.root, *name.split('/'))
+        try:
+            if os.stat(path).st_mtime > self.cutoff:
+                return False
+        except FileNotFoundError:
+            return True
+        if self.quarantine is None:
+            os.remove(path)
+            return True
+        target = os.path.join(self.quarantine, *name.split('/'))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.move(path, target)
+        return True
+
+    def report(self, elapsed, finished):
+        stats = self.stats
+        elapsed = max(elapsed, 1e-6)
+        action = (
+            'найдено' if self.dry_run
+            else 'перенесено' if self.quarantine else 'удалено'
+        )
+        self.stdout.write(
+            f'Проверено файлов: {stats["scanned"]} '
+            f'(моложе срока ожидания: {stats["recent"]}, '
+            f'используются: {stats["kept"]})\n'
+            f'Файлов без ссылок {action}: {stats["orphaned"]}, '
+            f'{stats["bytes"] / 1024 / 1024:.2f} МБ\n'
+            f'Записей MediaFile без ссылок '
+            f'{"найдено" if self.dry_run else "удалено"}: {stats["rows"]}\n'
+            f'Пакетов проверено в базе данных: {stats["queries"]}\n'
+            f'Время: {elapsed:.2f} с, '
+            f'{stats["scanned"] / elapsed:.0f} файлов/с'
+        )
+        if not finished:
+            self.stdout.write('Обход не завершен, следующий запуск '
+                              'продолжит его с сохраненной позиции.')
+        else:
+            self.stdout.write(self.style.SUCCESS('Обход завершен.'))
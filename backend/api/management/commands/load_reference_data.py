@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.bulk_load import REFERENCE_MODELS, load_reference_data
+
+
+class Command(BaseCommand):
+    help = (
+        'Пакетная загрузка ингредиентов и тегов из CSV, JSON или NDJSON. '
+        'Справочник определяется по имени файла (ingredients.csv, '
+        'tags.json) или параметром --model.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Файлы для загрузки.')
+        parser.add_argument(
+            '--model',
+            choices=sorted(REFERENCE_MODELS),
+            default=None,
+            help='Справочник, в который загружаются все файлы.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Число записей в одном INSERT.'
+        )
+        parser.add_argument(
+            '--copy',
+            action='store_true',
+            help='Загружать через COPY во временную таблицу (PostgreSQL).'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        for path in options['paths']:
+            started = time.monotonic()
+            try:
+                model, stats = load_reference_data(
+                    path, options['model'], options['batch_size'],
+                    options['copy']
+                )
+            except (OSError, ValueError) as error:
+                raise CommandError(f'{path}: {error}')
+            elapsed = max(time.monotonic() - started, 1e-6)
+            self.stdout.write(
+                f'{path} -> {model._meta.verbose_name_plural}: '
+                f'строк {stats["rows"]}, добавлено {stats["created"]}, '
+                f'дубликатов {stats["duplicates"]}, '
+                f'пропущено некорректных {stats["invalid"]} '
+                f'({elapsed:.2f} с, {stats["rows"] / elapsed:.0f} строк/с)'
+            )
+        self.stdout.write(self.style.SUCCESS('Загрузка завершена.'))
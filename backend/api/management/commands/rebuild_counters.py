@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.counters import COUNTERS, find_drift, rebuild_counter
+
+
+class Command(BaseCommand):
+    help = 'Проверка и пересчет счетчиков избранного, покупок и подписок.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить счетчики, ничего не изменяя.'
+        )
+
+    def handle(self, *args, **options):
+        total_drift = 0
+        for model, field, source, foreign_key in COUNTERS:
+            name = f'{model._meta.label}.{field}'
+            drift = find_drift(model, field, source, foreign_key)
+            total_drift += drift
+            if options['check']:
+                self.stdout.write(f'{name}: расхождений {drift}')
+                continue
+            with transaction.atomic():
+                rebuild_counter(model, field, source, foreign_key)
+            self.stdout.write(f'{name}: исправлено {drift}')
+        if options['check'] and total_drift:
+            raise CommandError(f'Найдено расхождений: {total_drift}')
+        self.stdout.write(self.style.SUCCESS('Счетчики в порядке.'))
@@ -0,0 +1,135 @@
+import os
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+
+from .images import DERIVED_VARIANTS, variant_name
+from .models import MediaFile
+
+# Модели и поля, которые ссылаются на файлы в хранилище.
+MEDIA_FIELDS = [
+    ('api.Recipe', 'image'),
+    ('users.User', 'avatar'),
+]
+
+
+def reserve(name):
+    """Блокировка записи MediaFile перед записью файла в хранилище.
+
+    Вызывается внутри транзакции; запись создается с нулем ссылок, если
+    ее нет. Пока транзакция открыта, delete_file для этого имени ждет,
+    а после коммита видит ссылку, добавленную acquire.
+    """
+
+    MediaFile.objects.select_for_update().get_or_create(
+        name=name, defaults={'references': 0}
+    )
+
+
+def acquire(name):
+    """Увеличение счетчика ссылок на файл."""
+
+    if not name:
+        return
+    media_file, created = MediaFile.objects.get_or_create(
+        name=name, defaults={'references': 1}
+    )
+    if not created:
+        MediaFile.objects.filter(pk=media_file.pk).update(
+            references=F('references') + 1
+        )
+
+
+def release(name):
+    """Уменьшение счетчика ссылок; файл без ссылок удаляется.
+
+    Файлы, для которых нет записи MediaFile (загруженные до появления
+    учета ссылок), не трогаются — их убирает сборщик мусора.
+    """
+
+    if not name:
+        return
+    if MediaFile.objects.filter(name=name, references__gt=0).update(
+        references=F('references') - 1
+    ):
+        transaction.on_commit(lambda: delete_file(name))
+
+
+def delete_file(name, storage=default_storage):
+    """Удаление файла без ссылок вместе с его уменьшенными вариантами.
+
+    Проверка и удаление идут под блокировкой записи MediaFile, которую
+    берет и ContentAddressedStorage при сохранении: повторная загрузка
+    того же файла либо дожидается удаления и записывает файл заново,
+    либо успевает добавить ссылку, и файл остается.
+    """
+
+    with transaction.atomic():
+        media_file = MediaFile.objects.select_for_update().filter(
+            name=name
+        ).first()
+        if media_file is None or media_file.references > 0:
+            return
+        storage.delete(name)
+        for variant in DERIVED_VARIANTS:
+            storage.delete(variant_name(name, variant))
+        media_file.delete()
+
+
+def variant_source(filename, siblings):
+    """Имя исходного файла для уменьшенного варианта или None."""
+
+    root, _ = os.path.splitext(filename)
+    for variant in DERIVED_VARIANTS:
+        suffix = f'_{variant}'
+        if root.endswith(suffix):
+            return siblings.get(root[:-len(suffix)])
+    return None
+
+
+def iter_media_files(root, after=(), exclude=(), relative=()):
+    """Потоковый обход папки медиафайлов в порядке сортировки путей.
+
+    Возвращает кортежи (части пути, DirEntry, имя исходного файла для
+    вариантов). Файлы и папки до after включительно пропускаются, что
+    позволяет продолжить прерванный обход. Скрытые файлы не обходятся.
+    """
+
+    with os.scandir(os.path.join(root, *relative)) as entries:
+        entries = sorted(
+            (entry for entry in entries if not entry.name.startswith('.')),
+            key=lambda entry: entry.name
+        )
+    siblings = {
+        os.path.splitext(entry.name)[0]: entry.name
+        for entry in entries if entry.is_file(follow_symlinks=False)
+    }
+    for entry in entries:
+        parts = relative + (entry.name,)
+        if entry.is_dir(follow_symlinks=False):
+            if (parts < after[:len(parts)]
+                    or os.path.abspath(entry.path) in exclude):
+                continue
+            yield from iter_media_files(root, after, exclude, parts)
+        elif entry.is_file(follow_symlinks=False) and parts > after:
+            source = variant_source(entry.name, siblings)
+            if source is not None:
+                source = '/'.join(relative + (source,))
+            yield parts, entry, source
+
+
+def referenced_names(names):
+    """Имена из names, на которые ссылаются записи в базе данных."""
+
+    names = list(names)
+    referenced = set(MediaFile.objects.filter(
+        name__in=names, references__gt=0
+    ).values_list('name', flat=True))
+    for label, field in MEDIA_FIELDS:
+        model = apps.get_model(label)
+        referenced.update(model._default_manager.filter(
+            **{f'{field}__in': names}
+        ).values_list(field, flat=True))
+    return referenced
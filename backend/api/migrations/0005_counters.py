@@ -0,0 +1,43 @@
+# Generated by Django 3.2.3 on 2026-10-18 12:00
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_related(apps, target, field, source, foreign_key):
+    Target = apps.get_model(*target.split('.'))
+    Source = apps.get_model(*source.split('.'))
+    Target.objects.update(**{field: Coalesce(Subquery(
+        Source.objects.filter(
+            **{foreign_key: OuterRef('pk')}
+        ).order_by().values(foreign_key).annotate(
+            count=Count('pk')
+        ).values('count')
+    ), Value(0))})
+
+
+def fill_counters(apps, schema_editor):
+    count_related(apps, 'api.Recipe', 'favorites_count', 'api.Favorite', 'recipe')
+    count_related(apps, 'api.Recipe', 'shopping_cart_count', 'api.ShoppingCart', 'recipe')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_recipe_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='favorites_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='В избранном'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='shopping_cart_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='В списках покупок'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
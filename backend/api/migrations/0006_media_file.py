@@ -0,0 +1,51 @@
+# Generated by Django 3.2.3 on 2026-10-18 12:00
+
+from collections import Counter
+
+from django.db import migrations, models
+
+MEDIA_FIELDS = [
+    ('api.Recipe', 'image'),
+    ('users.User', 'avatar'),
+]
+
+
+def count_references(apps, schema_editor):
+    references = Counter()
+    for label, field in MEDIA_FIELDS:
+        Model = apps.get_model(*label.split('.'))
+        references.update(
+            Model.objects.exclude(**{field: ''}).exclude(
+                **{f'{field}__isnull': True}
+            ).values_list(field, flat=True).iterator()
+        )
+    MediaFile = apps.get_model('api', 'MediaFile')
+    MediaFile.objects.bulk_create(
+        [MediaFile(name=name, references=count)
+         for name, count in references.items()],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_counters'),
+        ('users', '0002_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Путь к файлу')),
+                ('references', models.PositiveIntegerField(default=0, verbose_name='Количество ссылок')),
+            ],
+            options={
+                'verbose_name': 'Медиафайл',
+                'verbose_name_plural': 'Медиафайлы',
+            },
+        ),
+        migrations.RunPython(count_references, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,11 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Exists, F, OuterRef, Prefetch, Value, Window
+from django.db.models.functions import RowNumber
 from django.contrib.auth import get_user_model
 
 from .validators import tag_slug_validator
+from users.models import Follow
 from backend.constants import MEASURENT_LEN, SLUG_LEN, RECIPE_NAME_LEN
 
 User = get_user_model()
@@ -49,6 +53,95 @@ class Tag(models.Model):
         return self.name
 
 
+def with_subscription_flag(queryset, user):
+    """Аннотация флага is_subscribed для кверисета пользователей."""
+
+    if user is None or user.is_anonymous:
+        return queryset.annotate(
+            is_subscribed=Value(False, output_field=models.BooleanField())
+        )
+    return queryset.annotate(
+        is_subscribed=Exists(Follow.objects.filter(
+            user=user, author=OuterRef('pk')
+        ))
+    )
+
+
+class RecipeQuerySet(models.QuerySet):
+    """Кверисет рецептов."""
+
+    def with_user_flags(self, user):
+        """Аннотация флагов is_favorited и is_in_shopping_cart."""
+
+        if user is None or user.is_anonymous:
+            return self.annotate(
+                is_favorited=Value(False, output_field=models.BooleanField()),
+                is_in_shopping_cart=Value(
+                    False, output_field=models.BooleanField()
+                )
+            )
+        return self.annotate(
+            is_favorited=Exists(Favorite.objects.filter(
+                user=user, recipe=OuterRef('pk')
+            )),
+            is_in_shopping_cart=Exists(ShoppingCart.objects.filter(
+                user=user, recipe=OuterRef('pk')
+            ))
+        )
+
+    def previews(self, author_ids, limit=None):
+        """Рецепты авторов для превью, не больше limit на автора.
+
+        Все авторы страницы загружаются одним запросом: рецепты нумеруются
+        оконной функцией ROW_NUMBER() в разрезе автора. Возвращается словарь
+        {id автора: [рецепты]}.
+        """
+
+        if not author_ids:
+            return {}
+        queryset = self.filter(author_id__in=author_ids).only(
+            'id', 'name', 'image', 'cooking_time', 'author_id'
+        ).order_by('author_id', 'id')
+        if limit is not None:
+            queryset = queryset.annotate(row_number=Window(
+                RowNumber(), partition_by=[F('author_id')],
+                order_by=F('id').asc()
+            ))
+            sql, params = queryset.query.sql_with_params()
+            queryset = self.raw(
+                f'SELECT * FROM ({sql}) previews '
+                f'WHERE previews.row_number <= %s '
+                f'ORDER BY previews.author_id, previews.id',
+                (*params, limit)
+            )
+        previews = {}
+        for recipe in queryset:
+            previews.setdefault(recipe.author_id, []).append(recipe)
+        return previews
+
+    def for_read(self, user):
+        """Загрузка всех данных для RecipeReadSerializer.
+
+        Количество запросов не зависит от числа рецептов: автор с флагом
+        подписки, теги и ингредиенты подгружаются отдельными запросами.
+        Теги упорядочены по id, ингредиенты — по id записи RecipeIngredient,
+        как в api.fast_read и api.db_documents.
+        """
+
+        return self.with_user_flags(user).prefetch_related(
+            Prefetch('author', queryset=with_subscription_flag(
+                User.objects.all(), user
+            )),
+            Prefetch('tags', queryset=Tag.objects.order_by('id')),
+            Prefetch(
+                'recipeingredient_set',
+                queryset=RecipeIngredient.objects.select_related(
+                    'ingredient'
+                ).order_by('id')
+            )
+        )
+
+
 class Recipe(models.Model):
     """Модель рецептов."""
 
@@ -81,9 +174,31 @@ class Recipe(models.Model):
         verbose_name='Ингредиенты'
     )
 
+    favorites_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='В избранном'
+    )
+    shopping_cart_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='В списках покупок'
+    )
+    short_link_hits = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Переходов по короткой ссылке'
+    )
+    # GIN-индекс recipe_search_idx создается миграцией только в PostgreSQL,
+    # в SQLite поиск работает через таблицу FTS5 (см. api.search).
+    search_vector = SearchVectorField(
+        null=True, editable=False, verbose_name='Поисковый вектор'
+    )
+
+    objects = RecipeQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
+        indexes = [
+            models.Index(
+                fields=['created_at', 'id'], name='recipe_created_at_id_idx'
+            )
+        ]
 
     def __str__(self):
         return self.name
@@ -147,3 +262,21 @@ class ShoppingCart(BaseShoppingFavorite):
     class Meta:
         verbose_name = 'Список покупок'
         verbose_name_plural = 'Списки покупок'
+
+
+class MediaFile(models.Model):
+    """Количество ссылок на файл в хранилище медиафайлов."""
+
+    name = models.CharField(
+        max_length=255, unique=True, verbose_name='Путь к файлу'
+    )
+    references = models.PositiveIntegerField(
+        default=0, verbose_name='Количество ссылок'
+    )
+
+    class Meta:
+        verbose_name = 'Медиафайл'
+        verbose_name_plural = 'Медиафайлы'
+
+    def __str__(self):
+        return f'{self.name} ({self.references})'
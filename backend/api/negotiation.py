@@ -0,0 +1,15 @@
+from rest_framework.negotiation import BaseContentNegotiation
+
+
+class FileDownloadNegotiation(BaseContentNegotiation):
+    """Согласование для выгрузки файлов: всегда первый парсер и рендерер.
+
+    Accept и ?format= не участвуют в выборе рендерера: формат файла
+    проверяет сама вьюха, а ошибки выводятся первым рендерером (JSON).
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0] if parsers else None
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
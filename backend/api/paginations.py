@@ -1,6 +1,43 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class LimitCursorPagination(CursorPagination):
+    page_size_query_param = 'limit'
+    page_size = 6
+
+    def __init__(self, ordering):
+        self.ordering = ordering
 
 
 class LimitPagination(PageNumberPagination):
+    """Постраничная пагинация с переходом на курсорную по запросу клиента.
+
+    С параметром pagination=cursor (или cursor) страницы выбираются по
+    ключу сортировки вьюсета cursor_ordering, без OFFSET и COUNT(*).
+    """
+
     page_size_query_param = 'limit'
     page_size = 6
+    cursor_pagination_param = 'pagination'
+    cursor_paginator = None
+
+    def use_cursor(self, request):
+        return (request.query_params.get(self.cursor_pagination_param)
+                == 'cursor'
+                or LimitCursorPagination.cursor_query_param
+                in request.query_params)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.cursor_paginator = LimitCursorPagination(
+                getattr(view, 'cursor_ordering', ('id',))
+            )
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,162 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+current_profile = ContextVar('current_profile', default=None)
+
+
+class RequestProfile:
+    """Счетчики одного запроса: SQL, сериализация и рендеринг."""
+
+    def __init__(self):
+        self.view_name = None
+        self.queries = []
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        self.render_time = 0.0
+        self.render_started = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """Обертка execute_wrapper: время и текст каждого запроса."""
+
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.db_time += duration
+            self.queries.append((sql, duration))
+
+
+def profiled_data(prop):
+    """Замер времени свойства data у сериализатора без учета SQL."""
+
+    def data(self):
+        profile = current_profile.get()
+        if profile is None or profile.serializer_depth:
+            return prop.fget(self)
+        profile.serializer_depth += 1
+        db_time = profile.db_time
+        started = time.perf_counter()
+        try:
+            return prop.fget(self)
+        finally:
+            profile.serializer_time += (
+                time.perf_counter() - started - (profile.db_time - db_time)
+            )
+            profile.serializer_depth -= 1
+
+    return property(data)
+
+
+def instrument_serializers():
+    for serializer_class in (serializers.Serializer,
+                             serializers.ListSerializer):
+        if not getattr(serializer_class, '_profiled', False):
+            serializer_class.data = profiled_data(serializer_class.data)
+            serializer_class._profiled = True
+
+
+def view_name(view_func):
+    """Имя вида для логов: RecipeViewSet.download_shopping_cart."""
+
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        view_class = getattr(view_func, 'view_class', None)
+    if view_class is None:
+        return f'{view_func.__module__}.{view_func.__name__}'
+    return view_class.__name__
+
+
+class RequestProfilingMiddleware:
+    """Число SQL-запросов и время этапов запроса.
+
+    Результаты отдаются в заголовке Server-Timing и пишутся в лог
+    api.profiling одной JSON-строкой. Если запрос превысил
+    REQUEST_PROFILING_MAX_QUERIES запросов или REQUEST_PROFILING_MAX_MS
+    миллисекунд, в лог попадает полный список запросов. При выключенном
+    REQUEST_PROFILING middleware не подключается совсем.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instrument_serializers()
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        request.profile = profile
+        token = current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        total = time.perf_counter() - started
+        response['Server-Timing'] = self.server_timing(profile, total)
+        self.log(request, response, profile, total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        name = view_name(view_func)
+        actions = getattr(view_func, 'actions', None)
+        if actions:
+            name = f'{name}.{actions.get(request.method.lower(), "")}'
+        request.profile.view_name = name
+
+    def process_template_response(self, request, response):
+        profile = request.profile
+
+        def rendered(response):
+            profile.render_time += time.perf_counter() - profile.render_started
+
+        profile.render_started = time.perf_counter()
+        response.add_post_render_callback(rendered)
+        return response
+
+    @staticmethod
+    def server_timing(profile, total):
+        return ', '.join((
+            f'db;dur={profile.db_time * 1000:.1f};'
+            f'desc="{len(profile.queries)} queries"',
+            f'serializer;dur={profile.serializer_time * 1000:.1f}',
+            f'render;dur={profile.render_time * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ))
+
+    @staticmethod
+    def log(request, response, profile, total):
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': profile.view_name,
+            'status': response.status_code,
+            'queries': len(profile.queries),
+            'db_ms': round(profile.db_time * 1000, 1),
+            'serializer_ms': round(profile.serializer_time * 1000, 1),
+            'render_ms': round(profile.render_time * 1000, 1),
+            'total_ms': round(total * 1000, 1),
+        }
+        if (len(profile.queries) > settings.REQUEST_PROFILING_MAX_QUERIES
+                or total * 1000 > settings.REQUEST_PROFILING_MAX_MS):
+            record['sql'] = [
+                {'sql': sql, 'ms': round(duration * 1000, 2)}
+                for sql, duration in profile.queries
+            ]
+            logger.warning(json.dumps(record, ensure_ascii=False))
+        else:
+            logger.info(json.dumps(record, ensure_ascii=False))
@@ -0,0 +1,97 @@
+import hashlib
+
+from django.core.cache import DEFAULT_CACHE_ALIAS
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags, quote_etag
+from rest_framework.renderers import JSONRenderer
+
+from .caching import bump_versions, get_version
+
+
+def version_key(model):
+    return f'reference_version:{model._meta.label_lower}'
+
+
+def get_reference_version(model):
+    return get_version(DEFAULT_CACHE_ALIAS, version_key(model))
+
+
+def invalidate_reference_data(model):
+    """Сброс закодированных ответов и индексов справочной модели."""
+
+    bump_versions(DEFAULT_CACHE_ALIAS, [version_key(model)])
+
+
+class EncodedResponseStore:
+    """Закодированные в JSON ответы справочников в памяти процесса."""
+
+    def __init__(self):
+        self._responses = {}
+
+    def get(self, model, key, build):
+        """Тело ответа и его ETag; build вызывается при смене версии."""
+
+        version = get_reference_version(model)
+        cache_key = (model, key)
+        cached = self._responses.get(cache_key)
+        if cached is None or cached[0] != version:
+            body = JSONRenderer().render(build())
+            etag = quote_etag(hashlib.sha1(body).hexdigest())
+            cached = (version, body, etag)
+            self._responses[cache_key] = cached
+        return cached[1], cached[2]
+
+
+encoded_responses = EncodedResponseStore()
+
+
+class EncodedReferenceMixin:
+    """Отдача справочников заранее закодированными условными ответами.
+
+    Список без фильтров и отдельные объекты кодируются в JSON один раз
+    на процесс и версию данных, ответ содержит ETag, а совпадающий
+    If-None-Match получает 304.
+    """
+
+    def encoded_response(self, request, key, build):
+        body, etag = encoded_responses.get(
+            self.get_queryset().model, key, build
+        )
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(
+                body, content_type=JSONRenderer.media_type
+            )
+        response['ETag'] = etag
+        response['Cache-Control'] = 'public, no-cache'
+        return response
+
+    def is_encodable(self, request):
+        return (request.accepted_renderer.format == 'json'
+                and not request.query_params)
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_encodable(request):
+            return super().list(request, *args, **kwargs)
+        return self.encoded_response(
+            request, 'list',
+            lambda: super(EncodedReferenceMixin, self).list(
+                request, *args, **kwargs
+            ).data
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.is_encodable(request):
+            return super().retrieve(request, *args, **kwargs)
+        # Ключ нормализуется: /1/, /01/ и /001/ — один объект и одна запись.
+        try:
+            pk = int(kwargs[self.lookup_field])
+        except (TypeError, ValueError):
+            raise Http404
+        return self.encoded_response(
+            request, ('detail', pk),
+            lambda: super(EncodedReferenceMixin, self).retrieve(
+                request, *args, **kwargs
+            ).data
+        )
@@ -0,0 +1,118 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from backend.constants import (
+    RESPONSE_CACHE_LOCK_SECONDS,
+    RESPONSE_CACHE_POLL_SECONDS
+)
+from .caching import bump_versions, get_version
+
+RECIPE_LIST_VERSION_KEY = 'recipe_list_version'
+
+
+def bump_recipe_list_version():
+    """Сброс всех закешированных страниц списка рецептов."""
+
+    bump_versions(settings.RECIPE_LIST_CACHE, [RECIPE_LIST_VERSION_KEY])
+
+
+def normalized_query(request):
+    """Строка запроса с отсортированными параметрами и значениями.
+
+    ?tags=lunch&tags=breakfast&limit=6 и ?limit=6&tags=breakfast&tags=lunch
+    дают один и тот же ключ кеша.
+    """
+
+    return urlencode(sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+    ))
+
+
+def get_or_build(cache, key, build, timeout):
+    """Значение из кеша; при промахе его строит только один процесс.
+
+    Остальные процессы ждут, пока значение появится в кеше, но не дольше
+    RESPONSE_CACHE_LOCK_SECONDS. build может вернуть None — такое
+    значение не кешируется.
+    """
+
+    value = cache.get(key)
+    if value is not None:
+        return value
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, RESPONSE_CACHE_LOCK_SECONDS):
+        try:
+            value = build()
+            if value is not None:
+                cache.set(key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+    deadline = time.monotonic() + RESPONSE_CACHE_LOCK_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(RESPONSE_CACHE_POLL_SECONDS)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        if cache.get(lock_key) is None:
+            break
+    return build()
+
+
+class AnonymousListCacheMixin:
+    """Общий кеш готовых JSON-ответов списка для анонимных запросов.
+
+    Ключ — версия данных и нормализованная строка запроса, поэтому смена
+    версии (см. bump_recipe_list_version) сбрасывает все страницы сразу.
+    """
+
+    def is_cacheable(self, request):
+        return (request.user.is_anonymous
+                and request.accepted_renderer.format == 'json')
+
+    def list_cache_key(self, request):
+        version = get_version(
+            settings.RECIPE_LIST_CACHE, RECIPE_LIST_VERSION_KEY
+        )
+        query = hashlib.sha1(
+            f'{request.build_absolute_uri(request.path)}?'
+            f'{normalized_query(request)}'.encode()
+        ).hexdigest()
+        return f'recipe_list:{version}:{query}'
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return super().list(request, *args, **kwargs)
+        response = None
+
+        def build():
+            nonlocal response
+            response = super(AnonymousListCacheMixin, self).list(
+                request, *args, **kwargs
+            )
+            if response.status_code != status.HTTP_200_OK:
+                return None
+            if not isinstance(response, Response):
+                return response.content
+            return request.accepted_renderer.render(
+                response.data, request.accepted_media_type,
+                self.get_renderer_context()
+            )
+
+        body = get_or_build(
+            caches[settings.RECIPE_LIST_CACHE], self.list_cache_key(request),
+            build, settings.RECIPE_LIST_CACHE_TIMEOUT
+        )
+        if body is None:
+            return response
+        return HttpResponse(body, content_type=JSONRenderer.media_type)
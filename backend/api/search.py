@@ -0,0 +1,103 @@
+import re
+
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector
+)
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Recipe
+
+SEARCH_CONFIG = 'russian'
+SEARCH_VECTOR = (
+    SearchVector('name', weight='A', config=SEARCH_CONFIG)
+    + SearchVector('text', weight='B', config=SEARCH_CONFIG)
+)
+FTS_TABLE = 'api_recipe_fts'
+SNIPPET_START = '<b>'
+SNIPPET_STOP = '</b>'
+
+
+def update_search_index(recipe_ids):
+    """Обновление поисковых данных рецептов.
+
+    В PostgreSQL пересчитывается search_vector, в SQLite обновляется
+    таблица FTS5, которая заменяет его при разработке и в тестах.
+    """
+
+    recipe_ids = list(recipe_ids)
+    if connection.vendor == 'postgresql':
+        Recipe.objects.filter(pk__in=recipe_ids).update(
+            search_vector=SEARCH_VECTOR
+        )
+    elif connection.vendor == 'sqlite':
+        remove_from_search_index(recipe_ids)
+        placeholders = ', '.join(['%s'] * len(recipe_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, text) '
+                f'SELECT id, name, text FROM {Recipe._meta.db_table} '
+                f'WHERE id IN ({placeholders})',
+                recipe_ids
+            )
+
+
+def remove_from_search_index(recipe_ids):
+    recipe_ids = list(recipe_ids)
+    if connection.vendor == 'sqlite' and recipe_ids:
+        placeholders = ', '.join(['%s'] * len(recipe_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})',
+                recipe_ids
+            )
+
+
+def search_recipes(queryset, query):
+    """Полнотекстовый поиск по названию и описанию рецептов.
+
+    Рецепты сортируются по релевантности и получают аннотации
+    search_rank и search_snippet с выделенными совпадениями.
+    """
+
+    if connection.vendor == 'postgresql':
+        search_query = SearchQuery(
+            query, config=SEARCH_CONFIG, search_type='websearch'
+        )
+        return queryset.filter(search_vector=search_query).annotate(
+            search_rank=SearchRank(F('search_vector'), search_query),
+            search_snippet=SearchHeadline(
+                'text', search_query, config=SEARCH_CONFIG,
+                start_sel=SNIPPET_START, stop_sel=SNIPPET_STOP
+            )
+        ).order_by('-search_rank', 'id')
+    words = re.findall(r'\w+', query.lower())
+    if not words:
+        return queryset.none()
+    if connection.vendor != 'sqlite':
+        condition = Q()
+        for word in words:
+            condition &= Q(name__icontains=word) | Q(text__icontains=word)
+        return queryset.filter(condition)
+    match = ' '.join(f'"{word}"*' for word in words)
+    table = Recipe._meta.db_table
+    return queryset.filter(id__in=RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+        [match]
+    )).annotate(
+        search_rank=RawSQL(
+            f'SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id',
+            [match]
+        ),
+        search_snippet=RawSQL(
+            f"SELECT snippet({FTS_TABLE}, 1, %s, %s, '…', 16) "
+            f'FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id',
+            [SNIPPET_START, SNIPPET_STOP, match]
+        )
+    ).order_by('-search_rank', 'id')
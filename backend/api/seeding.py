@@ -0,0 +1,249 @@
+import logging
+import random
+from itertools import accumulate
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from .bulk_load import load_reference_data
+from .counters import COUNTERS, rebuild_counter
+from .models import (
+    Favorite,
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    ShoppingCart,
+    Tag
+)
+from .response_cache import bump_recipe_list_version
+from .search import update_search_index
+from users.models import Follow
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+# Имена синтетических пользователей: seed<seed>_<номер>.
+SEED_USERNAME_PREFIX = 'seed'
+
+# Объемы данных при масштабе 1; RecipeIngredient получается около 80 тыс.
+USERS_PER_SCALE = 1000
+RECIPES_PER_SCALE = 10_000
+FAVORITES_PER_USER = 20
+CART_RECIPES_PER_USER = 3
+FOLLOWS_PER_USER = 10
+# Показатель степенного распределения популярности авторов и продуктов.
+POPULARITY_EXPONENT = 1.1
+RECIPE_CHUNK_SIZE = 5000
+INSERT_BATCH_SIZE = 5000
+SEARCH_INDEX_CHUNK_SIZE = 500
+WORDS = (
+    'нарезать', 'смешать', 'обжарить', 'посолить', 'добавить', 'варить',
+    'запечь', 'остудить', 'подавать', 'взбить', 'тушить', 'перемешать',
+)
+
+
+def power_law_weights(count, exponent=POPULARITY_EXPONENT):
+    """Накопленные веса: элемент ранга r выбирается с вероятностью ~1/r^a."""
+
+    return list(accumulate(1 / rank ** exponent
+                           for rank in range(1, count + 1)))
+
+
+def sample_unique(rng, population, cum_weights, count):
+    """До count разных элементов по весам (повторы отбрасываются)."""
+
+    return set(rng.choices(population, cum_weights=cum_weights, k=count))
+
+
+class ScaleSeeder:
+    """Генератор синтетических данных для нагрузочных замеров.
+
+    Одинаковые seed и scale дают одинаковый набор данных. Все записи
+    вставляются через bulk_create, поэтому сигналы не срабатывают:
+    счетчики, поисковый индекс и кеши обновляются в конце. Ход работы
+    передается в log (по умолчанию — logger.info модуля).
+    """
+
+    def __init__(self, scale, seed=0, password='password', log=None):
+        self.scale = scale
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.password = password
+        self.log = log or logger.info
+        self.prefix = f'{SEED_USERNAME_PREFIX}{seed}_'
+
+    def run(self):
+        if User.objects.filter(username__startswith=self.prefix).exists():
+            raise ValueError(
+                f'Данные с seed={self.seed} уже созданы, выберите другой seed.'
+            )
+        self.ensure_reference_data()
+        user_ids = self.create_users(max(int(USERS_PER_SCALE * self.scale), 2))
+        recipe_ids = self.create_recipes(
+            user_ids, max(int(RECIPES_PER_SCALE * self.scale), 1)
+        )
+        self.create_links(Favorite, user_ids, recipe_ids, FAVORITES_PER_USER)
+        self.create_links(
+            ShoppingCart, user_ids, recipe_ids, CART_RECIPES_PER_USER
+        )
+        self.create_follows(user_ids)
+        self.finish(recipe_ids)
+
+    def ensure_reference_data(self):
+        data_dir = settings.BASE_DIR.parent / 'data'
+        for model, filename in ((Ingredient, 'ingredients.csv'),
+                                (Tag, 'tags.csv')):
+            if not model.objects.exists():
+                load_reference_data(str(data_dir / filename))
+        self.ingredient_ids = list(
+            Ingredient.objects.order_by('id').values_list('id', flat=True)
+        )
+        self.tag_ids = list(
+            Tag.objects.order_by('id').values_list('id', flat=True)
+        )
+        self.rng.shuffle(self.ingredient_ids)
+        self.ingredient_weights = power_law_weights(len(self.ingredient_ids))
+        self.tag_weights = power_law_weights(len(self.tag_ids))
+        self.ingredient_names = dict(
+            Ingredient.objects.values_list('id', 'name')
+        )
+
+    def insert(self, model, objects):
+        model.objects.bulk_create(objects, batch_size=INSERT_BATCH_SIZE)
+
+    def new_ids(self, model, last_id):
+        return list(model.objects.filter(pk__gt=last_id).order_by(
+            'pk'
+        ).values_list('pk', flat=True))
+
+    def last_id(self, model):
+        return model.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+
+    def create_users(self, count):
+        password = make_password(self.password)
+        last_id = self.last_id(User)
+        with transaction.atomic():
+            self.insert(User, [
+                User(
+                    username=f'{self.prefix}{number}',
+                    email=f'{self.prefix}{number}@example.com',
+                    first_name='Имя', last_name=f'Фамилия {number}',
+                    password=password
+                )
+                for number in range(count)
+            ])
+        user_ids = self.new_ids(User, last_id)
+        self.log(f'Пользователей: {len(user_ids)}')
+        return user_ids
+
+    def create_recipes(self, user_ids, count):
+        authors = list(user_ids)
+        self.rng.shuffle(authors)
+        author_weights = power_law_weights(len(authors))
+        recipe_ids = []
+        links = 0
+        for start in range(0, count, RECIPE_CHUNK_SIZE):
+            size = min(RECIPE_CHUNK_SIZE, count - start)
+            ingredients = [self.pick_ingredients() for _ in range(size)]
+            last_id = self.last_id(Recipe)
+            with transaction.atomic():
+                self.insert(Recipe, [
+                    Recipe(
+                        author_id=self.rng.choices(
+                            authors, cum_weights=author_weights
+                        )[0],
+                        name=self.recipe_name(chosen, start + number),
+                        text=' '.join(self.rng.choices(WORDS, k=30)),
+                        cooking_time=self.rng.randint(5, 180)
+                    )
+                    for number, chosen in enumerate(ingredients)
+                ])
+                chunk_ids = self.new_ids(Recipe, last_id)
+                recipe_ingredients = [
+                    RecipeIngredient(
+                        recipe_id=recipe_id, ingredient_id=ingredient_id,
+                        amount=self.rng.randint(1, 500)
+                    )
+                    for recipe_id, chosen in zip(chunk_ids, ingredients)
+                    for ingredient_id in chosen
+                ]
+                self.insert(RecipeIngredient, recipe_ingredients)
+                self.insert(Recipe.tags.through, [
+                    Recipe.tags.through(recipe_id=recipe_id, tag_id=tag_id)
+                    for recipe_id in chunk_ids
+                    for tag_id in sample_unique(
+                        self.rng, self.tag_ids, self.tag_weights,
+                        self.rng.randint(1, 3)
+                    )
+                ])
+            recipe_ids.extend(chunk_ids)
+            links += len(recipe_ingredients)
+            self.log(f'Рецептов: {len(recipe_ids)}, ингредиентов в '
+                     f'рецептах: {links}')
+        return recipe_ids
+
+    def pick_ingredients(self):
+        count = min(max(int(self.rng.lognormvariate(2.2, 0.4)), 2), 30)
+        return sample_unique(
+            self.rng, self.ingredient_ids, self.ingredient_weights, count
+        )
+
+    def recipe_name(self, ingredient_ids, number):
+        main = self.ingredient_names[min(ingredient_ids)]
+        return f'{main.capitalize()} по-домашнему №{number}'
+
+    def create_links(self, model, user_ids, recipe_ids, per_user):
+        """Избранное или покупки: популярные рецепты выбираются чаще."""
+
+        recipes = list(recipe_ids)
+        self.rng.shuffle(recipes)
+        weights = power_law_weights(len(recipes))
+        total = 0
+        for start in range(0, len(user_ids), INSERT_BATCH_SIZE):
+            objects = [
+                model(user_id=user_id, recipe_id=recipe_id)
+                for user_id in user_ids[start:start + INSERT_BATCH_SIZE]
+                for recipe_id in sample_unique(
+                    self.rng, recipes, weights,
+                    self.rng.randint(0, per_user * 2)
+                )
+            ]
+            with transaction.atomic():
+                self.insert(model, objects)
+            total += len(objects)
+        self.log(f'{model._meta.verbose_name_plural}: {total}')
+
+    def create_follows(self, user_ids):
+        authors = list(user_ids)
+        self.rng.shuffle(authors)
+        weights = power_law_weights(len(authors))
+        total = 0
+        for start in range(0, len(user_ids), INSERT_BATCH_SIZE):
+            objects = [
+                Follow(user_id=user_id, author_id=author_id)
+                for user_id in user_ids[start:start + INSERT_BATCH_SIZE]
+                for author_id in sample_unique(
+                    self.rng, authors, weights,
+                    self.rng.randint(0, FOLLOWS_PER_USER * 2)
+                )
+                if author_id != user_id
+            ]
+            with transaction.atomic():
+                self.insert(Follow, objects)
+            total += len(objects)
+        self.log(f'Подписок: {total}')
+
+    def finish(self, recipe_ids):
+        for model, field, source, foreign_key in COUNTERS:
+            rebuild_counter(model, field, source, foreign_key)
+        for start in range(0, len(recipe_ids), SEARCH_INDEX_CHUNK_SIZE):
+            update_search_index(
+                recipe_ids[start:start + SEARCH_INDEX_CHUNK_SIZE]
+            )
+        bump_recipe_list_version()
+        self.log('Счетчики и поисковый индекс обновлены.')
@@ -1,9 +1,8 @@
-import base64
-
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from django.core.files.base import ContentFile
+from django.db import transaction
 
+from .fields import Base64ImageField, ImageVariantsField
 from .models import (
     Ingredient,
     Tag,
@@ -12,24 +11,12 @@ from .models import (
     ShoppingCart,
     Favorite
 )
+from .shopping_list import bump_recipe_cart_versions
 from users.serializers import UserSerializer
 
 User = get_user_model()
 
 
-class Base64ImageField(serializers.ImageField):
-    """Базовый сериализатор для загрузки изображений."""
-
-    def to_internal_value(self, data):
-        if isinstance(data, str) and data.startswith('data:image'):
-            format, imgstr = data.split(';base64,')
-            ext = format.split('/')[-1]
-
-            data = ContentFile(base64.b64decode(imgstr), name='temp.' + ext)
-
-        return super().to_internal_value(data)
-
-
 class BaseShopFavoriteSerializer(serializers.ModelSerializer):
     """Базовый сериализатор для добавления в список покупок и избранного."""
 
@@ -70,10 +57,7 @@ class TagSerializer(serializers.ModelSerializer):
 class AddIngredientSerializer(serializers.ModelSerializer):
     """Сериализатор для добавления ингредиентов в рецепт."""
 
-    id = serializers.PrimaryKeyRelatedField(
-        queryset=Ingredient.objects.all(),
-        source='ingredient'
-    )
+    id = serializers.IntegerField(source='ingredient.id')
     amount = serializers.IntegerField()
     name = serializers.CharField(
         required=False,
@@ -102,6 +86,7 @@ class RecipeReadSerializer(serializers.ModelSerializer):
     )
     tags = TagSerializer(many=True, read_only=True)
     image = Base64ImageField(required=False, allow_null=True)
+    image_variants = ImageVariantsField(source='image')
     is_favorited = serializers.SerializerMethodField()
     is_in_shopping_cart = serializers.SerializerMethodField()
 
@@ -116,22 +101,35 @@ class RecipeReadSerializer(serializers.ModelSerializer):
             'is_in_shopping_cart',
             'name',
             'image',
+            'image_variants',
             'text',
             'cooking_time'
         ]
 
-    def shoping_favorite(self, model, obj):
+    def shoping_favorite(self, model, obj, annotation):
         request = self.context.get('request')
         if not request or request.user.is_anonymous:
             return False
+        value = getattr(obj, annotation, None)
+        if value is not None:
+            return value
         return model.objects.filter(
             user=request.user, recipe=obj).exists()
 
     def get_is_favorited(self, obj):
-        return self.shoping_favorite(Favorite, obj)
+        return self.shoping_favorite(Favorite, obj, 'is_favorited')
 
     def get_is_in_shopping_cart(self, obj):
-        return self.shoping_favorite(ShoppingCart, obj)
+        return self.shoping_favorite(
+            ShoppingCart, obj, 'is_in_shopping_cart'
+        )
+
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        search_snippet = getattr(instance, 'search_snippet', None)
+        if search_snippet is not None:
+            representation['search_snippet'] = search_snippet
+        return representation
 
 
 class RecipeWriteSerializer(serializers.ModelSerializer):
@@ -161,12 +159,20 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError(
                     'Количество ингредиента должно быть больше нуля!'
                 )
-            ingredient_id = ingredient.get('ingredient').id
+            ingredient_id = ingredient['ingredient']['id']
             ingredients_data.append(ingredient_id)
         if len(ingredients_data) != len(set(ingredients_data)):
             raise serializers.ValidationError(
                 'Ингредиенты не должны повторятся!'
             )
+        found = Ingredient.objects.in_bulk(ingredients_data)
+        missing = [pk for pk in ingredients_data if pk not in found]
+        if missing:
+            raise serializers.ValidationError(
+                f'Ингредиенты не существуют: {missing}'
+            )
+        for ingredient in ingredients:
+            ingredient['ingredient'] = found[ingredient['ingredient']['id']]
         return ingredients
 
     def validate_tags(self, tags):
@@ -188,15 +194,49 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
         return cooking_time
 
     def add_ingredients_tags(self, recipe, ingredients, tags):
-        for ingredient_data in ingredients:
-            ingredient_id = ingredient_data.get('ingredient')
-            RecipeIngredient.objects.create(
+        RecipeIngredient.objects.bulk_create(
+            RecipeIngredient(
                 recipe=recipe,
-                ingredient=ingredient_id,
-                amount=ingredient_data.get('amount')
+                ingredient=ingredient_data['ingredient'],
+                amount=ingredient_data['amount']
             )
+            for ingredient_data in ingredients
+        )
         recipe.tags.set(tags)
 
+    def update_ingredients(self, recipe, ingredients):
+        """Изменение ингредиентов рецепта только по разнице.
+
+        Новые строки добавляются одним bulk_create, изменившиеся количества
+        обновляются одним bulk_update, лишние строки удаляются.
+        """
+
+        existing = {
+            recipe_ingredient.ingredient_id: recipe_ingredient
+            for recipe_ingredient in recipe.recipeingredient_set.all()
+        }
+        to_create, to_update = [], []
+        for ingredient_data in ingredients:
+            ingredient = ingredient_data['ingredient']
+            amount = ingredient_data['amount']
+            recipe_ingredient = existing.pop(ingredient.id, None)
+            if recipe_ingredient is None:
+                to_create.append(RecipeIngredient(
+                    recipe=recipe, ingredient=ingredient, amount=amount
+                ))
+            elif recipe_ingredient.amount != amount:
+                recipe_ingredient.amount = amount
+                to_update.append(recipe_ingredient)
+        if existing:
+            RecipeIngredient.objects.filter(
+                pk__in=[item.pk for item in existing.values()]
+            ).delete()
+        RecipeIngredient.objects.bulk_create(to_create)
+        RecipeIngredient.objects.bulk_update(to_update, ['amount'])
+        if to_create or to_update:
+            bump_recipe_cart_versions([recipe.id])
+
+    @transaction.atomic
     def create(self, validated_data):
         ingredients = validated_data.pop('ingredients', [])
         tags = validated_data.pop('tags')
@@ -204,6 +244,7 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
         self.add_ingredients_tags(recipe, ingredients, tags)
         return recipe
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         ingredients = validated_data.pop('ingredients', [])
         tags = validated_data.pop('tags', [])
@@ -217,8 +258,9 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
         instance.cooking_time = validated_data.get(
             'cooking_time', instance.cooking_time
         )
-        instance.ingredients.clear()
-        self.add_ingredients_tags(instance, ingredients, tags)
+        instance.save()
+        self.update_ingredients(instance, ingredients)
+        instance.tags.set(tags)
         return instance
 
 
@@ -0,0 +1,247 @@
+import csv
+import io
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.db.models import Sum
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from .caching import bump_versions, get_version
+from .models import Ingredient, ShoppingCart
+from backend.constants import (
+    LINE_STEP,
+    PDF_SPOOL_MAX_SIZE,
+    STREAM_CHUNK_LINES,
+    X_CORD,
+    Y_CORD,
+    Y_CORD_MIN
+)
+
+FONTS_DIR = settings.BASE_DIR / 'pdf_fonts'
+HEADER = 'Список покупок:'
+CSV_HEADER = ['name', 'measurement_unit', 'amount']
+
+
+def get_shopping_list(user):
+    """Суммарное количество ингредиентов из списка покупок пользователя.
+
+    Строки RecipeIngredient рецептов из корзины группируются по ингредиенту
+    одним запросом, поэтому итоги считает база данных. Возвращаются словари
+    с ключами id, name, measurement_unit и amount.
+    """
+
+    return Ingredient.objects.filter(
+        recipeingredient__recipe__shoppingcart__user=user
+    ).values(
+        'id', 'name', 'measurement_unit'
+    ).annotate(
+        amount=Sum('recipeingredient__amount')
+    ).order_by('name')
+
+
+def cart_version_key(user_id):
+    return f'shopping_cart_version:{user_id}'
+
+
+def get_cart_version(user_id):
+    return get_version(settings.SHOPPING_LIST_CACHE, cart_version_key(user_id))
+
+
+def bump_cart_versions(user_ids):
+    """Сброс кешированных списков покупок пользователей."""
+
+    bump_versions(
+        settings.SHOPPING_LIST_CACHE,
+        (cart_version_key(user_id) for user_id in set(user_ids))
+    )
+
+
+def bump_recipe_cart_versions(recipe_ids):
+    """Сброс списков покупок всех, у кого рецепты лежат в корзине."""
+
+    bump_cart_versions(ShoppingCart.objects.filter(
+        recipe_id__in=recipe_ids
+    ).values_list('user_id', flat=True))
+
+
+@lru_cache(maxsize=None)
+def register_fonts():
+    """Регистрация шрифтов один раз на процесс.
+
+    TTFont встраивает в документ только использованные глифы.
+    """
+
+    pdfmetrics.registerFont(
+        TTFont('Verdana-Bold', FONTS_DIR / 'Verdana-Bold.ttf')
+    )
+    pdfmetrics.registerFont(TTFont('Verdana', FONTS_DIR / 'Verdana.ttf'))
+
+
+def format_line(ingredient):
+    return (
+        f'- {ingredient["name"]}: {ingredient["amount"]},'
+        f'{ingredient["measurement_unit"]}.'
+    )
+
+
+def chunked(lines):
+    """Объединение строк в блоки для потоковой отдачи."""
+
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == STREAM_CHUNK_LINES:
+            yield ''.join(chunk).encode()
+            chunk = []
+    if chunk:
+        yield ''.join(chunk).encode()
+
+
+def render_pdf(shopping_list):
+    """Многостраничный PDF во временном файле, готовом к чтению.
+
+    Файл держится в памяти, пока не превысит PDF_SPOOL_MAX_SIZE, затем
+    переносится на диск.
+    """
+
+    register_fonts()
+    output = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE)
+    pdf_object = canvas.Canvas(output)
+    pdf_object.setFont('Verdana-Bold', 16)
+    pdf_object.drawString(X_CORD, Y_CORD, HEADER)
+    pdf_object.setFont('Verdana', 12)
+    y = Y_CORD
+    for ingredient in shopping_list:
+        y -= LINE_STEP
+        if y < Y_CORD_MIN:
+            pdf_object.showPage()
+            pdf_object.setFont('Verdana', 12)
+            y = Y_CORD
+        pdf_object.drawString(X_CORD, y, format_line(ingredient))
+    pdf_object.showPage()
+    pdf_object.save()
+    output.seek(0)
+    return output
+
+
+def render_txt(shopping_list):
+    """Построчная текстовая выгрузка без reportlab."""
+
+    lines = (f'{format_line(ingredient)}\n' for ingredient in shopping_list)
+    yield f'{HEADER}\n'.encode()
+    yield from chunked(lines)
+
+
+def render_csv(shopping_list):
+    """Выгрузка в CSV без reportlab."""
+
+    def lines():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        rows = ([ingredient[field] for field in CSV_HEADER]
+                for ingredient in shopping_list)
+        for row in itertools.chain([CSV_HEADER], rows):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(row)
+            yield buffer.getvalue()
+
+    yield from chunked(lines())
+
+
+def render_json(shopping_list):
+    """Выгрузка в JSON: массив словарей из get_shopping_list."""
+
+    items = (
+        (',' if number else '') + json.dumps(
+            ingredient, ensure_ascii=False, separators=(',', ':')
+        )
+        for number, ingredient in enumerate(shopping_list)
+    )
+    yield b'['
+    yield from chunked(items)
+    yield b']'
+
+
+def write_output(output, file):
+    """Запись результата рендерера (файл или генератор блоков) в файл."""
+
+    if hasattr(output, 'read'):
+        with output:
+            shutil.copyfileobj(output, file)
+    else:
+        for chunk in output:
+            file.write(chunk)
+
+
+def open_cached(user_id, version, file_format):
+    """Файл списка покупок для версии корзины, открытый на чтение.
+
+    Готовые файлы лежат в SHOPPING_LIST_ROOT, по папке на пользователя;
+    в имени файла — версия корзины. Файл рендерится блоками во временный
+    файл рядом и переименовывается, если для этой версии его еще нет или
+    он старше SHOPPING_LIST_CACHE_TIMEOUT. Содержимое не собирается в
+    памяти целиком.
+
+    Возвращается дескриптор, открытый до переименования, поэтому
+    параллельная очистка не может удалить файл из-под запроса. Очистка
+    удаляет только файлы того же формата старше только что записанного.
+    """
+
+    directory = os.path.join(settings.SHOPPING_LIST_ROOT, str(user_id))
+    name = f'{version}.{file_format}'
+    path = os.path.join(directory, name)
+    try:
+        file = open(path, 'rb')
+    except FileNotFoundError:
+        pass
+    else:
+        if (time.time() - os.fstat(file.fileno()).st_mtime
+                < settings.SHOPPING_LIST_CACHE_TIMEOUT):
+            return file
+        file.close()
+    os.makedirs(directory, exist_ok=True)
+    render, _ = SHOPPING_LIST_RENDERERS[file_format]
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    file = os.fdopen(descriptor, 'w+b')
+    try:
+        write_output(render(get_shopping_list(user_id)), file)
+        file.flush()
+        os.replace(temp_path, path)
+    except BaseException:
+        file.close()
+        os.remove(temp_path)
+        raise
+    written = os.fstat(file.fileno()).st_mtime
+    remove_older(directory, f'.{file_format}', name, written)
+    file.seek(0)
+    return file
+
+
+def remove_older(directory, suffix, keep, mtime):
+    """Удаление файлов с окончанием suffix, записанных раньше mtime."""
+
+    for entry in os.scandir(directory):
+        if entry.name == keep or not entry.name.endswith(suffix):
+            continue
+        try:
+            if entry.stat().st_mtime < mtime:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+SHOPPING_LIST_RENDERERS = {
+    'pdf': (render_pdf, 'application/pdf'),
+    'txt': (render_txt, 'text/plain; charset=utf-8'),
+    'csv': (render_csv, 'text/csv; charset=utf-8'),
+    'json': (render_json, 'application/json'),
+}
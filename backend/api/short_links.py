@@ -0,0 +1,122 @@
+import atexit
+import logging
+import string
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.db import connections
+from django.db.models import F
+from django.http import Http404
+
+from backend.constants import SHORT_LINK_CACHE_SIZE, SHORT_LINK_FLUSH_SECONDS
+from .models import Recipe
+
+logger = logging.getLogger(__name__)
+
+ALPHABET = string.digits + string.ascii_letters
+BASE = len(ALPHABET)
+
+
+def encode(number):
+    """Число в код base62."""
+
+    if number < 0:
+        raise ValueError('Код можно получить только для числа >= 0.')
+    code = ''
+    while True:
+        number, digit = divmod(number, BASE)
+        code = ALPHABET[digit] + code
+        if not number:
+            return code
+
+
+def decode(code):
+    """Код base62 в число; ValueError для некорректного кода."""
+
+    if not code or (len(code) > 1 and code[0] == ALPHABET[0]):
+        raise ValueError(f'Некорректный код: {code}')
+    number = 0
+    for char in code:
+        digit = ALPHABET.find(char)
+        if digit < 0:
+            raise ValueError(f'Некорректный код: {code}')
+        number = number * BASE + digit
+    return number
+
+
+@lru_cache(maxsize=SHORT_LINK_CACHE_SIZE)
+def existing_recipe(pk):
+    """Id рецепта, если он существует, иначе Http404.
+
+    Найденные id кешируются в памяти процесса, так что популярные
+    ссылки открываются без запросов к базе данных. Несуществующие id
+    не кешируются (исключение lru_cache не запоминает).
+    """
+
+    if not Recipe.objects.filter(pk=pk).exists():
+        raise Http404
+    return pk
+
+
+def resolve(code):
+    """Id рецепта по короткому коду base62."""
+
+    try:
+        pk = decode(code)
+    except ValueError:
+        raise Http404
+    return existing_recipe(pk)
+
+
+class HitCounter:
+    """Счетчик переходов, который пишет в базу данных в фоне.
+
+    Переход только увеличивает счетчик в памяти; накопленные значения
+    раз в SHORT_LINK_FLUSH_SECONDS сохраняются отдельным потоком.
+    """
+
+    def __init__(self, interval=SHORT_LINK_FLUSH_SECONDS):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.hits = Counter()
+        self.flushed_at = time.monotonic()
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='short-links'
+        )
+
+    def record(self, pk):
+        with self.lock:
+            self.hits[pk] += 1
+            now = time.monotonic()
+            if now - self.flushed_at < self.interval:
+                return
+            self.flushed_at = now
+        self.executor.submit(self.flush_in_thread)
+
+    def flush(self):
+        """Запись накопленных переходов: один UPDATE на значение счетчика."""
+
+        with self.lock:
+            hits, self.hits = self.hits, Counter()
+        grouped = defaultdict(list)
+        for pk, count in hits.items():
+            grouped[count].append(pk)
+        for count, ids in grouped.items():
+            Recipe.objects.filter(pk__in=ids).update(
+                short_link_hits=F('short_link_hits') + count
+            )
+
+    def flush_in_thread(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception('Не удалось сохранить переходы по ссылкам')
+        finally:
+            connections.close_all()
+
+
+hit_counter = HitCounter()
+atexit.register(hit_counter.flush_in_thread)
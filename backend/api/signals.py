@@ -0,0 +1,141 @@
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save
+)
+from django.dispatch import receiver
+from import_export.signals import post_import
+
+from .counters import COUNTED_MODELS, update_counters
+from .images import schedule_variants
+from .media import MEDIA_FIELDS, acquire, release
+from .models import Ingredient, Recipe, RecipeIngredient, ShoppingCart, Tag
+from .reference_data import invalidate_reference_data
+from .response_cache import bump_recipe_list_version
+from .search import remove_from_search_index, update_search_index
+from .shopping_list import bump_cart_versions, bump_recipe_cart_versions
+from .short_links import existing_recipe
+
+User = get_user_model()
+
+# Поля автора, которые выводятся в списке рецептов.
+AUTHOR_LIST_FIELDS = {'username', 'first_name', 'last_name', 'email', 'avatar'}
+
+
+@receiver([post_save, post_delete], sender=ShoppingCart)
+def shopping_cart_changed(sender, instance, **kwargs):
+    bump_cart_versions([instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=RecipeIngredient)
+def recipe_ingredient_changed(sender, instance, **kwargs):
+    bump_recipe_cart_versions([instance.recipe_id])
+
+
+@receiver(post_save, sender=Ingredient)
+def ingredient_changed(sender, instance, created, **kwargs):
+    if not created:
+        bump_recipe_cart_versions(RecipeIngredient.objects.filter(
+            ingredient=instance
+        ).values('recipe_id'))
+
+
+@receiver([post_save, post_delete], sender=Ingredient)
+@receiver([post_save, post_delete], sender=Tag)
+def reference_data_changed(sender, **kwargs):
+    invalidate_reference_data(sender)
+
+
+@receiver([post_save, post_delete], sender=Recipe)
+@receiver([post_save, post_delete], sender=RecipeIngredient)
+@receiver([post_save, post_delete], sender=Ingredient)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_list_changed(sender, action='post', **kwargs):
+    if action.startswith('post'):
+        bump_recipe_list_version()
+
+
+@receiver(post_save, sender=User)
+def author_changed(sender, created, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields is None or AUTHOR_LIST_FIELDS & set(update_fields):
+        bump_recipe_list_version()
+
+
+@receiver(post_import)
+def reference_data_imported(sender, model, **kwargs):
+    if model in (Ingredient, Tag):
+        invalidate_reference_data(model)
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_saved(sender, instance, **kwargs):
+    update_search_index([instance.pk])
+    schedule_variants(instance.image.name)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    schedule_variants(instance.avatar.name)
+
+
+@receiver(post_delete, sender=Recipe)
+def recipe_deleted(sender, instance, **kwargs):
+    remove_from_search_index([instance.pk])
+    existing_recipe.cache_clear()
+
+
+def counted_object_saved(sender, instance, created, **kwargs):
+    if created:
+        update_counters(instance, 1)
+
+
+def counted_object_deleted(sender, instance, **kwargs):
+    update_counters(instance, -1)
+
+
+for counted_model in COUNTED_MODELS:
+    post_save.connect(counted_object_saved, sender=counted_model)
+    post_delete.connect(counted_object_deleted, sender=counted_model)
+
+
+def media_field_name(sender):
+    return dict(MEDIA_FIELDS)[sender._meta.label]
+
+
+def remember_media(sender, instance, update_fields=None, **kwargs):
+    field = media_field_name(sender)
+    if update_fields is not None and field not in update_fields:
+        return
+    previous = None
+    if instance.pk is not None:
+        previous = sender._default_manager.filter(
+            pk=instance.pk
+        ).values_list(field, flat=True).first()
+    instance._previous_media = previous or ''
+
+
+def media_saved(sender, instance, **kwargs):
+    if not hasattr(instance, '_previous_media'):
+        return
+    previous = instance.__dict__.pop('_previous_media')
+    current = getattr(instance, media_field_name(sender)).name or ''
+    if current != previous:
+        acquire(current)
+        release(previous)
+
+
+def media_deleted(sender, instance, **kwargs):
+    release(getattr(instance, media_field_name(sender)).name)
+
+
+for label, _ in MEDIA_FIELDS:
+    media_model = apps.get_model(label)
+    pre_save.connect(remember_media, sender=media_model)
+    post_save.connect(media_saved, sender=media_model)
+    post_delete.connect(media_deleted, sender=media_model)
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+
+from .images import DERIVED_VARIANTS, variant_name
+from .media import reserve
+
+HASH_NAME = re.compile(r'^[0-9a-f]{64}')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранилище, в котором имя файла — хеш SHA-256 его содержимого.
+
+    Файлы раскладываются по вложенным папкам по первым символам хеша
+    (recipe_images/ab/cd/abcd….webp), одинаковые загрузки сохраняются один
+    раз. Имена, которые уже начинаются с хеша (например, уменьшенные
+    варианты изображения), сохраняются как есть.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def addressed_name(self, name, content):
+        directory, filename = os.path.split(name)
+        if HASH_NAME.match(filename):
+            return name
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        content_hash = digest.hexdigest()
+        _, ext = os.path.splitext(filename)
+        return os.path.join(
+            directory, content_hash[:2], content_hash[2:4],
+            f'{content_hash}{ext.lower()}'
+        )
+
+    def save_variants(self, name, content):
+        """Сохранение уменьшенных вариантов из api.images.ImageUpload."""
+
+        for variant, data in getattr(content, 'variants', {}).items():
+            target = variant_name(name, variant)
+            if not self.exists(target):
+                self.write(target, ContentFile(data))
+
+    def write(self, name, content):
+        """Атомарная запись: временный файл в той же папке и os.replace."""
+
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                for chunk in content.chunks():
+                    file.write(chunk)
+            os.chmod(temp_path, self.file_permissions_mode or 0o644)
+            os.replace(temp_path, full_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def touch(self, name):
+        """Обновление mtime повторно загруженного файла и его вариантов.
+
+        collect_orphaned_media не трогает файлы моложе срока ожидания,
+        а старый файл без ссылок мог бы попасть под удаление до того, как
+        новая ссылка на него сохранится в базе.
+        """
+
+        for target in [name] + [
+            variant_name(name, variant) for variant in DERIVED_VARIANTS
+        ]:
+            try:
+                os.utime(self.path(target))
+            except FileNotFoundError:
+                pass
+
+    def _save(self, name, content):
+        if HASH_NAME.match(os.path.basename(name)):
+            if not self.exists(name):
+                self.write(name, content)
+            return name
+        name = self.addressed_name(name, content)
+        # Запись файла и блокировка MediaFile в одной транзакции с
+        # acquire вызывающего кода (см. api.media.delete_file).
+        with transaction.atomic():
+            reserve(name)
+            if self.exists(name):
+                self.touch(name)
+            else:
+                self.write(name, content)
+        self.save_variants(name, content)
+        return name
@@ -0,0 +1,23 @@
+import tempfile
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import override_settings
+
+
+class ShoppingListFilesMixin:
+    """Отдельная папка для файлов списка покупок и чистые версии корзин.
+
+    Id пользователей в тестах повторяются, поэтому без этого тест мог бы
+    получить файл, оставшийся от другого теста.
+    """
+
+    def setUp(self):
+        super().setUp()
+        caches[settings.SHOPPING_LIST_CACHE].clear()
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.shopping_list_root = root.name
+        settings_override = override_settings(SHOPPING_LIST_ROOT=root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
@@ -0,0 +1,132 @@
+import json
+import os
+import random
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from rest_framework.renderers import JSONRenderer
+
+from api.benchmarks import backends, serializers
+from api.benchmarks.load import (
+    SCENARIO_WEIGHTS, Fixtures, LoadRunner, Scenarios, percentile,
+)
+from api.tests.mixins import ShoppingListFilesMixin
+
+
+class BenchmarkApiTest(ShoppingListFilesMixin, TestCase):
+    """Нагрузочный прогон API внутри процесса."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_scale', '0.005', stdout=StringIO())
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([7], 0.95), 7)
+
+    def test_same_seed_gives_same_requests_with_threads(self):
+        class RecordingTransport:
+            name = 'recording'
+
+            def __init__(self):
+                self.sent = []
+
+            def send(self, method, path, token):
+                self.sent.append((method, path, token))
+                return 200, None
+
+        fixtures = Fixtures(random.Random(0))
+        requests = {}
+        for concurrency in (1, 4):
+            transport = RecordingTransport()
+            LoadRunner(
+                transport, Scenarios(fixtures, random.Random(0)),
+                SCENARIO_WEIGHTS, concurrency
+            ).run(40)
+            requests[concurrency] = sorted(transport.sent)
+        self.assertEqual(requests[1], requests[4])
+
+    def test_report_and_baseline(self):
+        directory = tempfile.mkdtemp()
+        output = os.path.join(directory, 'result.json')
+        self.addCleanup(os.rmdir, directory)
+        self.addCleanup(os.remove, output)
+        call_command('benchmark_api', '--requests', '60', '--warmup', '0',
+                     '--output', output, stdout=StringIO())
+        with open(output, encoding='utf-8') as file:
+            result = json.load(file)
+        self.assertEqual(result['errors'], 0)
+        self.assertGreaterEqual(result['requests'], 60)
+        detail = result['endpoints']['recipe_detail']
+        self.assertLessEqual(detail['p50_ms'], detail['p99_ms'])
+        self.assertGreater(detail['queries_per_request'], 0)
+        stdout = StringIO()
+        call_command('benchmark_api', '--requests', '10', '--warmup', '0',
+                     '--scenario', 'recipe_list=0', '--baseline', output,
+                     stdout=stdout)
+        self.assertIn('Сравнение с базовым прогоном', stdout.getvalue())
+
+    def test_recipe_backends_return_same_documents(self):
+        result = backends.run(random.Random(0), requests=8, warmup=0)
+        self.assertEqual(list(result['backends']), list(backends.BACKENDS))
+        for name, stats in result['backends'].items():
+            with self.subTest(backend=name):
+                self.assertEqual(stats['mismatches'], 0)
+                self.assertEqual(
+                    set(stats['endpoints']), {'recipe_list', 'recipe_detail'}
+                )
+                for endpoint, endpoint_stats in stats['endpoints'].items():
+                    self.assertEqual(
+                        endpoint_stats['compact_bytes_per_response'],
+                        result['backends']['orm']['endpoints'][endpoint][
+                            'compact_bytes_per_response'
+                        ]
+                    )
+        self.assertEqual(
+            result['backends']['db_documents']['fallback'],
+            connection.vendor != 'postgresql'
+        )
+
+
+class SerializerBenchmarkTest(SimpleTestCase):
+    """Микробенчмарк сериализаторов без базы данных."""
+
+    def test_cases_do_not_query_database(self):
+        results = serializers.run(sizes=(2,), repeat=1)
+        self.assertEqual(set(results), {
+            'RecipeReadSerializer[2]', 'RecipeDocuments[2]',
+            'UserSerializer[2]', 'SubscribeSerializer[2]',
+            'IngredientSerializer[2]',
+        })
+        for stats in results.values():
+            self.assertGreater(stats['median_us_per_object'], 0)
+
+    def test_recipe_graph_matches_read_serializer_output(self):
+        data = serializers.build_cases(1)['RecipeReadSerializer']()[0]
+        self.assertTrue(
+            serializers.MIN_INGREDIENTS <= len(data['ingredients'])
+            <= serializers.MAX_INGREDIENTS
+        )
+        self.assertEqual(len(data['tags']), 2)
+        self.assertTrue(data['image'].startswith('http://localhost/media/'))
+
+    def test_recipe_documents_match_read_serializer(self):
+        cases = serializers.build_cases(5)
+        self.assertEqual(
+            JSONRenderer().render(cases['RecipeDocuments']()),
+            JSONRenderer().render(cases['RecipeReadSerializer']())
+        )
+
+    def test_per_object_stats_use_serialized_count(self):
+        size = len(serializers.ObjectGraph().ingredients) + 500
+        results = serializers.run(
+            sizes=(size,), repeat=1, names={'IngredientSerializer'}
+        )
+        self.assertEqual(
+            results[f'IngredientSerializer[{size}]']['objects'], size - 500
+        )
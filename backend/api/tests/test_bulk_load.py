@@ -0,0 +1,76 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from api.bulk_load import iter_json
+from api.models import Ingredient, Tag
+
+
+class LoadReferenceDataTest(TestCase):
+    """Пакетная загрузка справочников из файлов."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def write(self, filename, content):
+        path = os.path.join(self.directory, filename)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        return path
+
+    def load(self, *args):
+        call_command('load_reference_data', *args, stdout=StringIO())
+
+    def test_csv_is_deduplicated_and_idempotent(self):
+        path = self.write('ingredients.csv', (
+            'name,measurement_unit\n'
+            'соль,г\n'
+            ' соль ,г\n'
+            'соль,щепотка\n'
+            ',г\n'
+        ))
+        self.load(path)
+        self.load(path)
+        self.assertEqual(
+            set(Ingredient.objects.values_list('name', 'measurement_unit')),
+            {('соль', 'г'), ('соль', 'щепотка')}
+        )
+
+    def test_json_and_ndjson(self):
+        rows = [{'name': f'Тег {number}', 'slug': f'tag{number}'}
+                for number in range(5)]
+        json_path = self.write('tags.json', json.dumps(rows))
+        ndjson_path = self.write('extra.ndjson', '\n'.join(
+            json.dumps(row) for row in rows + [{'name': 'Ужин',
+                                                'slug': 'dinner'}]
+        ))
+        self.load(json_path, '--batch-size', '2')
+        self.load(ndjson_path, '--model', 'tags')
+        self.assertEqual(Tag.objects.count(), 6)
+
+    def test_iter_json_reads_in_chunks(self):
+        rows = [{'name': 'а' * 100, 'measurement_unit': 'г'}] * 2000
+        items = list(iter_json(StringIO(json.dumps(rows))))
+        self.assertEqual(items, rows)
+
+    @unittest.skipUnless(connection.vendor == 'postgresql',
+                         'COPY поддерживается только в PostgreSQL.')
+    def test_copy_twice_in_one_transaction(self):
+        path = self.write('ingredients.csv', (
+            'name,measurement_unit\n'
+            'соль,г\n'
+        ))
+        # TestCase держит открытой внешнюю транзакцию.
+        self.load(path, '--copy')
+        self.load(path, '--copy')
+        self.assertEqual(Ingredient.objects.count(), 1)
@@ -0,0 +1,60 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from api.models import Favorite, Recipe, ShoppingCart
+from users.models import Follow
+
+User = get_user_model()
+
+
+class CountersTest(TestCase):
+    """Денормализованные счетчики и их пересчет."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.author = (
+            User.objects.create(
+                username=name, email=f'{name}@example.com',
+                first_name='Имя', last_name='Фамилия', password='password'
+            )
+            for name in ('user', 'author')
+        )
+        cls.recipe = Recipe.objects.create(
+            name='Рецепт', text='Описание', author=cls.author, cooking_time=5
+        )
+
+    def assertCounters(self, obj, **counters):
+        obj.refresh_from_db()
+        for field, value in counters.items():
+            self.assertEqual(getattr(obj, field), value, field)
+
+    def test_counters_follow_changes(self):
+        favorite = Favorite.objects.create(user=self.user, recipe=self.recipe)
+        ShoppingCart.objects.create(user=self.user, recipe=self.recipe)
+        Follow.objects.create(user=self.user, author=self.author)
+        self.assertCounters(self.recipe, favorites_count=1,
+                            shopping_cart_count=1)
+        self.assertCounters(self.author, recipes_count=1, followers_count=1)
+        self.assertCounters(self.user, following_count=1,
+                            shopping_cart_count=1)
+        favorite.delete()
+        self.recipe.delete()
+        Follow.objects.all().delete()
+        self.assertCounters(self.author, recipes_count=0, followers_count=0)
+        self.assertCounters(self.user, following_count=0,
+                            shopping_cart_count=0)
+
+    def test_rebuild_repairs_drift(self):
+        Favorite.objects.create(user=self.user, recipe=self.recipe)
+        Recipe.objects.update(favorites_count=7)
+        User.objects.update(recipes_count=0)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_counters', '--check', stdout=StringIO())
+        call_command('rebuild_counters', stdout=StringIO())
+        call_command('rebuild_counters', '--check', stdout=StringIO())
+        self.assertCounters(self.recipe, favorites_count=1)
+        self.assertCounters(self.author, recipes_count=1)
@@ -0,0 +1,166 @@
+import json
+import os
+import unittest
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from api.benchmarks.backends import compact_json
+from api.db_documents import paginated_body
+from api.models import (
+    Favorite,
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    ShoppingCart,
+    Tag
+)
+from users.models import Follow
+
+User = get_user_model()
+
+
+class PaginatedBodyTest(SimpleTestCase):
+    """Вставка готового массива results в ответ пагинатора."""
+
+    def test_results_replace_empty_list(self):
+        envelope = OrderedDict([
+            ('count', 2), ('next', 'http://localhost/api/recipes/?page=2'),
+            ('previous', None), ('results', []),
+        ])
+        body = paginated_body(
+            envelope, JSONRenderer(), b'[{"id" : 1}, \n {"id" : 2}]'
+        )
+        self.assertEqual(
+            json.loads(body), {**envelope, 'results': [{'id': 1}, {'id': 2}]}
+        )
+        self.assertTrue(body.startswith(JSONRenderer().render(envelope)[:-4]))
+
+    def test_results_not_last(self):
+        envelope = OrderedDict([('results', []), ('next', None)])
+        body = paginated_body(envelope, JSONRenderer(), b'[{"id" : 1}]')
+        self.assertEqual(json.loads(body),
+                         {'results': [{'id': 1}], 'next': None})
+
+
+POSTGRESQL_ONLY = unittest.skipUnless(
+    connection.vendor == 'postgresql',
+    'json_build_object есть только в PostgreSQL.'
+)
+
+
+class DatabaseDocumentsTest(APITestCase):
+    """Документы рецептов из PostgreSQL совпадают с RecipeReadSerializer.
+
+    Сравнение имеет смысл только в PostgreSQL: в других СУБД оба ответа
+    строит ORM. В CI тесты идут на PostgreSQL, это проверяет
+    test_ci_uses_postgresql (переменная REQUIRE_POSTGRESQL).
+    """
+
+    url = '/api/recipes/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = User.objects.create(
+            username='reader', email='reader@example.com',
+            first_name='Имя', last_name='Фамилия', password='password'
+        )
+        authors = [
+            User.objects.create(
+                username=f'author{number}',
+                email=f'author{number}@example.com',
+                first_name='Имя', last_name='Фамилия', password='password',
+                avatar=f'user_images/ab/cd/avatar{number}.webp'
+                if number else ''
+            )
+            for number in range(2)
+        ]
+        Follow.objects.create(user=cls.reader, author=authors[1])
+        tags = [
+            Tag.objects.create(name=f'Тег {number}', slug=f'tag{number}')
+            for number in range(3)
+        ]
+        ingredients = [
+            Ingredient.objects.create(
+                name=f'Ингредиент {number}', measurement_unit='г'
+            )
+            for number in range(4)
+        ]
+        cls.recipes = []
+        for number in range(5):
+            recipe = Recipe.objects.create(
+                name=f'Рецепт {number}',
+                text=f'Описание "{number}"\\ <b>',
+                author=authors[number % 2], cooking_time=number + 1,
+                image=f'recipe_images/ab/cd/recipe{number}.webp'
+                if number % 3 else None
+            )
+            # Обратный порядок связей: теги в документе идут по id тега.
+            for tag in reversed(tags[:number % 3 + 1]):
+                recipe.tags.add(tag)
+            for ingredient in reversed(ingredients[number % 2:]):
+                RecipeIngredient.objects.create(
+                    recipe=recipe, ingredient=ingredient, amount=number + 1
+                )
+            if number % 2:
+                Favorite.objects.create(user=cls.reader, recipe=recipe)
+                ShoppingCart.objects.create(user=cls.reader, recipe=recipe)
+            cls.recipes.append(recipe)
+
+    def fetch(self, enabled, url, params=None):
+        caches[settings.RECIPE_LIST_CACHE].clear()
+        with override_settings(RECIPE_DB_DOCUMENTS=enabled):
+            return self.client.get(url, params)
+
+    def assert_same(self, url, params=None):
+        for user in (None, self.reader):
+            with self.subTest(user=user, url=url, params=params):
+                self.client.force_authenticate(user)
+                documents = self.fetch(True, url, params)
+                expected = self.fetch(False, url, params)
+                self.assertEqual(documents.status_code, expected.status_code)
+                self.assertEqual(documents.json(), expected.json())
+                # Тела отличаются только разделителями json_build_object.
+                self.assertEqual(compact_json(documents.json()),
+                                 expected.content)
+
+    @unittest.skipUnless(os.getenv('REQUIRE_POSTGRESQL'),
+                         'Проверка окружения CI.')
+    def test_ci_uses_postgresql(self):
+        self.assertEqual(connection.vendor, 'postgresql')
+
+    @POSTGRESQL_ONLY
+    def test_list(self):
+        self.assert_same(self.url, {'limit': 3, 'page': 2})
+        self.assert_same(self.url, {'tags': ['tag1', 'tag2']})
+        self.assert_same(self.url, {'pagination': 'cursor', 'limit': 2})
+
+    @POSTGRESQL_ONLY
+    def test_detail(self):
+        for recipe in self.recipes:
+            self.assert_same(f'{self.url}{recipe.pk}/')
+        self.assert_same(f'{self.url}0/')
+
+    @unittest.skipIf(connection.vendor == 'postgresql',
+                     'Путь через ORM используется в других СУБД.')
+    def test_other_vendors_use_orm(self):
+        self.client.force_authenticate(self.reader)
+        for url in (self.url, f'{self.url}{self.recipes[0].pk}/'):
+            with self.subTest(url=url):
+                self.assertEqual(self.fetch(True, url).content,
+                                 self.fetch(False, url).content)
+
+    @POSTGRESQL_ONLY
+    def test_query_count(self):
+        self.client.force_authenticate(self.reader)
+        with override_settings(RECIPE_DB_DOCUMENTS=True):
+            with self.assertNumQueries(3):
+                self.client.get(self.url)
+            with self.assertNumQueries(1):
+                self.client.get(f'{self.url}{self.recipes[0].pk}/')
@@ -0,0 +1,174 @@
+import datetime
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from api.models import (
+    Favorite,
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    ShoppingCart,
+    Tag
+)
+from api.renderers import FastJSONRenderer
+from users.models import Follow
+
+User = get_user_model()
+
+
+class FastReadParityTest(APITestCase):
+    """Быстрый список рецептов совпадает с RecipeReadSerializer байт в байт."""
+
+    url = '/api/recipes/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = User.objects.create(
+            username='reader', email='reader@example.com',
+            first_name='Имя', last_name='Фамилия', password='password'
+        )
+        authors = [
+            User.objects.create(
+                username=f'author{number}',
+                email=f'author{number}@example.com',
+                first_name='Имя "в кавычках"', last_name='Фамилия',
+                password='password',
+                avatar=f'user_images/ab/cd/avatar{number}.webp'
+                if number else ''
+            )
+            for number in range(3)
+        ]
+        Follow.objects.create(user=cls.reader, author=authors[1])
+        tags = [
+            Tag.objects.create(name=f'Тег {number}', slug=f'tag{number}')
+            for number in range(3)
+        ]
+        ingredients = [
+            Ingredient.objects.create(
+                name=f'Ингредиент {number}', measurement_unit='г'
+            )
+            for number in range(5)
+        ]
+        for number in range(8):
+            recipe = Recipe.objects.create(
+                name=f'Капуста №{number}',
+                text=f'Тушить капусту {number} минут;\u2028"кавычки" \\ <b>',
+                author=authors[number % 3], cooking_time=number + 1,
+                image=f'recipe_images/ab/cd/recipe{number}.webp'
+                if number % 4 else None
+            )
+            # Теги и ингредиенты связываются в обратном порядке, чтобы
+            # порядок связей не совпадал с порядком id.
+            recipe.tags.add(*reversed(tags[:number % 3 + 1]))
+            RecipeIngredient.objects.bulk_create(
+                RecipeIngredient(recipe=recipe, ingredient=ingredient,
+                                 amount=number * 10 + 1)
+                for ingredient in reversed(ingredients[number % 2::2])
+            )
+            if number % 2:
+                Favorite.objects.create(user=cls.reader, recipe=recipe)
+            if number % 3:
+                ShoppingCart.objects.create(user=cls.reader, recipe=recipe)
+
+    def fetch(self, fast, params):
+        caches[settings.RECIPE_LIST_CACHE].clear()
+        with override_settings(RECIPE_FAST_READ=fast):
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def assert_parity(self, params):
+        for user in (None, self.reader):
+            with self.subTest(user=user, **params):
+                self.client.force_authenticate(user)
+                self.assertEqual(self.fetch(True, params),
+                                 self.fetch(False, params))
+
+    def test_list(self):
+        self.assert_parity({'limit': 8})
+
+    def test_pages(self):
+        self.assert_parity({'limit': 3, 'page': 2})
+
+    def test_filters(self):
+        self.assert_parity({'tags': ['tag1', 'tag2'], 'limit': 8})
+        self.assert_parity({'is_favorited': 1, 'is_in_shopping_cart': 1})
+
+    def test_search_snippet(self):
+        self.assert_parity({'search': 'капусту'})
+        self.assertIn(
+            b'search_snippet', self.fetch(True, {'search': 'капусту'})
+        )
+
+    def test_cursor_pagination(self):
+        self.client.force_authenticate(self.reader)
+        params = {'pagination': 'cursor', 'limit': 3}
+        fast = self.fetch(True, params)
+        self.assertEqual(fast, self.fetch(False, params))
+        cursor = self.client.get(self.url, params).json()['next']
+        params['cursor'] = cursor.split('cursor=')[1].split('&')[0]
+        self.assertEqual(self.fetch(True, params), self.fetch(False, params))
+
+    def test_nested_order(self):
+        for fast in (True, False):
+            with self.subTest(fast=fast):
+                for recipe in json.loads(self.fetch(fast, {'limit': 8}))[
+                    'results'
+                ]:
+                    tag_ids = [tag['id'] for tag in recipe['tags']]
+                    self.assertEqual(tag_ids, sorted(tag_ids))
+                    self.assertEqual(
+                        [item['id'] for item in recipe['ingredients']],
+                        list(RecipeIngredient.objects.filter(
+                            recipe_id=recipe['id']
+                        ).order_by('id').values_list(
+                            'ingredient_id', flat=True
+                        ))
+                    )
+
+    def count_queries(self, fast):
+        caches[settings.RECIPE_LIST_CACHE].clear()
+        with override_settings(RECIPE_FAST_READ=fast):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(self.url, {'limit': 8})
+        return len(queries)
+
+    def test_query_count_matches_orm(self):
+        for user in (None, self.reader):
+            with self.subTest(user=user):
+                self.client.force_authenticate(user)
+                self.assertEqual(self.count_queries(True),
+                                 self.count_queries(False))
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    """FastJSONRenderer выводит те же байты, что и JSONRenderer."""
+
+    def test_same_output(self):
+        data = {
+            'text': 'разделители \u2028 и \u2029, "кавычки"',
+            'numbers': [1, -2, 0, 2 ** 40],
+            'flags': (True, False, None),
+            'nested': {'пустой': {}, 'список': []},
+            'date': datetime.datetime(2026, 10, 18, 12, 0, 0, 123456),
+        }
+        for payload in (data, [data], {'big': 2 ** 70}, None):
+            with self.subTest(payload=payload):
+                self.assertEqual(FastJSONRenderer().render(payload),
+                                 JSONRenderer().render(payload))
+
+    def test_indent_falls_back(self):
+        self.assertEqual(
+            FastJSONRenderer().render(
+                {'a': [1]}, 'application/json; indent=2'
+            ),
+            JSONRenderer().render({'a': [1]}, 'application/json; indent=2')
+        )
@@ -0,0 +1,103 @@
+import base64
+import shutil
+import struct
+import tempfile
+import zlib
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+from PIL import Image
+
+from api.images import (
+    DERIVED_VARIANTS,
+    IMAGE_VARIANTS,
+    ImageError,
+    build_variants,
+    prepare,
+    variant_name
+)
+from backend.constants import MAX_IMAGE_PIXELS
+
+
+def make_image(size, image_format='PNG'):
+    buffer = BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, image_format)
+    return buffer.getvalue()
+
+
+def header_only_png(width, height):
+    """PNG, в заголовке которого заявлены размеры, а данных нет."""
+
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data
+                + struct.pack('>I', zlib.crc32(kind + data)))
+
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height,
+                                         8, 2, 0, 0, 0))
+            + chunk(b'IEND', b''))
+
+
+class ImagePipelineTest(SimpleTestCase):
+    """Проверка и перекодирование загружаемых изображений."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.storage = FileSystemStorage(location=self.media_root)
+
+    def tearDown(self):
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_prepare_limits_sizes(self):
+        full, variants = prepare(make_image((4000, 1000)))
+        image = Image.open(BytesIO(full))
+        self.assertLessEqual(image.width, IMAGE_VARIANTS['full'][0])
+        self.assertEqual(image.width // image.height, 4)
+        self.assertEqual(set(variants), set(DERIVED_VARIANTS))
+
+    def test_rejects_too_many_pixels_and_garbage(self):
+        side = int(MAX_IMAGE_PIXELS ** 0.5) + 1
+        buffer = BytesIO()
+        Image.new('1', (side, side)).save(buffer, 'PNG')
+        with self.assertRaises(ImageError):
+            prepare(buffer.getvalue())
+        with self.assertRaises(ImageError):
+            prepare(header_only_png(20000, 20000))
+        with self.assertRaises(ImageError):
+            prepare(b'not an image')
+
+    def test_build_variants(self):
+        name = self.storage.save(
+            'recipe_images/image.webp', ContentFile(prepare(
+                make_image((1200, 800), 'JPEG')
+            )[0])
+        )
+        build_variants(name, self.storage)
+        for variant in DERIVED_VARIANTS:
+            with self.storage.open(variant_name(name, variant)) as file:
+                image = Image.open(file)
+                self.assertLessEqual(max(image.size),
+                                     max(IMAGE_VARIANTS[variant]))
+
+
+class ImageUploadValidationTest(APITestCase):
+    """Ошибки в загружаемых изображениях возвращают 400."""
+
+    def test_decompression_bomb_is_rejected(self):
+        user = get_user_model().objects.create(
+            username='user', email='user@example.com',
+            first_name='Имя', last_name='Фамилия', password='password'
+        )
+        self.client.force_authenticate(user)
+        data = base64.b64encode(header_only_png(20000, 20000)).decode()
+        response = self.client.put(
+            '/api/users/me/avatar/',
+            {'avatar': f'data:image/png;base64,{data}'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('avatar', response.json())
@@ -0,0 +1,40 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from api.models import Ingredient
+
+
+class IngredientSearchTest(APITestCase):
+    """Поиск ингредиентов по индексу в памяти."""
+
+    url = '/api/ingredients/'
+
+    @classmethod
+    def setUpTestData(cls):
+        for name in ('ванильный сахар', 'Сахар', 'сахарная пудра', 'соль'):
+            Ingredient.objects.create(name=name, measurement_unit='г')
+
+    def setUp(self):
+        cache.clear()
+
+    def names(self, response):
+        return [item['name'] for item in response.data]
+
+    def test_prefix_hits_before_substring_hits(self):
+        response = self.client.get(self.url, {'name': 'САХ'})
+        self.assertEqual(self.names(response),
+                         ['Сахар', 'сахарная пудра', 'ванильный сахар'])
+
+    def test_steady_state_without_queries(self):
+        self.client.get(self.url, {'name': 'с'})
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {'name': 'со'})
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.json()), Ingredient.objects.count())
+
+    def test_index_rebuilt_on_save(self):
+        self.client.get(self.url, {'name': 'мука'})
+        Ingredient.objects.create(name='мука', measurement_unit='г')
+        response = self.client.get(self.url, {'name': 'мука'})
+        self.assertEqual(self.names(response), ['мука'])
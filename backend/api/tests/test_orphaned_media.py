@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import time
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from api.images import variant_name
+from api.models import MediaFile, Recipe
+
+User = get_user_model()
+MEDIA_ROOT = tempfile.mkdtemp()
+DAY = 24 * 3600
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class CollectOrphanedMediaTest(TestCase):
+    """Удаление файлов, на которые не ссылаются записи в базе данных."""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        os.makedirs(MEDIA_ROOT)
+        author = User.objects.create(
+            username='author', email='author@example.com',
+            first_name='Имя', last_name='Фамилия', password='password'
+        )
+        self.image = 'recipe_images/aa/bb/used.webp'
+        Recipe.objects.create(
+            author=author, name='Рецепт', text='Описание',
+            cooking_time=10, image=self.image
+        )
+        self.used = [self.image, variant_name(self.image, 'thumbnail')]
+        self.orphans = [
+            'recipe_images/aa/bb/old.webp',
+            variant_name('recipe_images/aa/bb/old.webp', 'card'),
+            'user_images/zz.png',
+        ]
+        self.recent = 'recipe_images/cc/new.webp'
+        for name in self.used + self.orphans:
+            self.create_file(name, age=2 * DAY)
+        self.create_file(self.recent, age=0)
+
+    def create_file(self, name, age):
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(b'data')
+        moment = time.time() - age
+        os.utime(path, (moment, moment))
+
+    def path(self, name):
+        return os.path.join(MEDIA_ROOT, *name.split('/'))
+
+    def run_command(self, *args):
+        output = StringIO()
+        call_command('collect_orphaned_media', *args, stdout=output)
+        return output.getvalue()
+
+    def existing(self):
+        return {
+            name for name in self.used + self.orphans + [self.recent]
+            if os.path.exists(self.path(name))
+        }
+
+    def test_dry_run_only_reports(self):
+        output = self.run_command('--dry-run')
+        for name in self.orphans:
+            self.assertIn(name, output)
+        self.assertEqual(len(self.existing()), 6)
+
+    def test_removes_only_old_unreferenced_files(self):
+        self.run_command()
+        self.assertEqual(self.existing(), set(self.used + [self.recent]))
+
+    def test_quarantine_keeps_files(self):
+        quarantine = os.path.join(MEDIA_ROOT, 'quarantine')
+        self.run_command('--quarantine', quarantine)
+        self.assertEqual(self.existing(), set(self.used + [self.recent]))
+        for name in self.orphans:
+            self.assertTrue(os.path.exists(
+                os.path.join(quarantine, *name.split('/'))
+            ))
+
+    def test_resumes_after_limit(self):
+        output = self.run_command('--limit', '2', '--batch-size', '1')
+        self.assertIn('Обход не завершен', output)
+        self.assertTrue(
+            os.path.exists(os.path.join(MEDIA_ROOT, '.orphaned_media.json'))
+        )
+        output = self.run_command()
+        self.assertIn('Проверено файлов: 4', output)
+        self.assertEqual(self.existing(), set(self.used + [self.recent]))
+        self.assertFalse(
+            os.path.exists(os.path.join(MEDIA_ROOT, '.orphaned_media.json'))
+        )
+
+    def test_reuploaded_orphan_is_kept(self):
+        name = default_storage.save(
+            'recipe_images/photo.webp', ContentFile(b'reused')
+        )
+        moment = time.time() - 2 * DAY
+        os.utime(self.path(name), (moment, moment))
+        default_storage.save(
+            'recipe_images/photo.webp', ContentFile(b'reused')
+        )
+        self.run_command()
+        self.assertTrue(os.path.exists(self.path(name)))
+
+    def test_removes_zero_reference_rows(self):
+        old, fresh = 'recipe_images/dd/old.webp', 'recipe_images/dd/new.webp'
+        self.create_file(old, age=2 * DAY)
+        self.create_file(fresh, age=0)
+        for name in (old, fresh, 'recipe_images/dd/gone.webp'):
+            MediaFile.objects.create(name=name, references=0)
+        self.run_command('--dry-run')
+        self.assertEqual(MediaFile.objects.filter(references=0).count(), 3)
+        output = self.run_command()
+        self.assertIn('Записей MediaFile без ссылок удалено: 2', output)
+        self.assertFalse(os.path.exists(self.path(old)))
+        self.assertEqual(list(MediaFile.objects.filter(
+            references=0
+        ).values_list('name', flat=True)), [fresh])
@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+from api.models import Recipe
+
+User = get_user_model()
+
+
+class CursorPaginationTest(APITestCase):
+    """Курсорная пагинация рецептов по запросу клиента."""
+
+    url = '/api/recipes/'
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create(
+            username='author', email='author@example.com',
+            first_name='Имя', last_name='Фамилия', password='password'
+        )
+        Recipe.objects.bulk_create(
+            Recipe(name=f'Рецепт {number}', text='Описание',
+                   author=author, cooking_time=10)
+            for number in range(7)
+        )
+
+    def test_cursor_pages_cover_all_recipes_without_count(self):
+        url, ids = self.url + '?pagination=cursor&limit=3', []
+        while url:
+            data = self.client.get(url).json()
+            self.assertNotIn('count', data)
+            ids += [recipe['id'] for recipe in data['results']]
+            url = data['next']
+        self.assertEqual(ids, list(Recipe.objects.order_by(
+            'created_at', 'id'
+        ).values_list('id', flat=True)))
+
+    def test_page_number_pagination_is_default(self):
+        data = self.client.get(self.url, {'limit': 3, 'page': 2}).json()
+        self.assertEqual(data['count'], 7)
+        self.assertEqual(len(data['results']), 3)
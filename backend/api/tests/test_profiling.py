@@ -0,0 +1,63 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api.models import Recipe
+from api.tests.mixins import ShoppingListFilesMixin
+
+User = get_user_model()
+
+
+@override_settings(REQUEST_PROFILING=True, REQUEST_PROFILING_MAX_QUERIES=100,
+                   REQUEST_PROFILING_MAX_MS=60_000)
+class RequestProfilingTest(ShoppingListFilesMixin, TestCase):
+    """Заголовок Server-Timing и лог с числом SQL-запросов."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username='author', email='author@example.com',
+            first_name='Имя', last_name='Фамилия', password='password'
+        )
+        Recipe.objects.create(
+            author=cls.user, name='Рецепт', text='Описание',
+            cooking_time=10
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url):
+        with self.assertLogs('api.profiling') as logs:
+            response = self.client.get(url)
+        return response, [json.loads(line.split(':', 2)[2])
+                          for line in logs.output]
+
+    def test_header_and_log_record(self):
+        response, records = self.get('/api/recipes/')
+        timing = response['Server-Timing']
+        for metric in ('db;', 'serializer;', 'render;', 'total;'):
+            self.assertIn(metric, timing)
+        record = records[0]
+        self.assertEqual(record['view'], 'RecipeViewSet.list')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+        self.assertIn(f'desc="{record["queries"]} queries"', timing)
+        self.assertNotIn('sql', record)
+
+    def test_action_name_and_threshold(self):
+        with override_settings(REQUEST_PROFILING_MAX_QUERIES=0):
+            _, records = self.get('/api/recipes/download_shopping_cart/')
+        record = records[0]
+        self.assertEqual(record['view'],
+                         'RecipeViewSet.download_shopping_cart')
+        self.assertEqual(len(record['sql']), record['queries'])
+
+    @override_settings(REQUEST_PROFILING=False)
+    def test_disabled(self):
+        response = APIClient().get('/api/recipes/')
+        self.assertNotIn('Server-Timing', response)
@@ -0,0 +1,144 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import (
+    Favorite,
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    ShoppingCart,
+    Tag
+)
+from api.shopping_list import SHOPPING_LIST_RENDERERS
+from api.tests.mixins import ShoppingListFilesMixin
+from users.models import Follow
+
+User = get_user_model()
+
+SMALL, LARGE = 3, 15
+ROLES = ('anonymous', 'user', 'admin')
+
+
+class QueryBudgetTest(ShoppingListFilesMixin, APITestCase):
+    """Число SQL-запросов эндпоинтов не растет вместе с размером ответа.
+
+    Каждый эндпоинт вызывается анонимно, обычным пользователем и
+    администратором на маленьком и большом наборе данных; при расхождении
+    в сообщении об ошибке выводятся запросы обоих прогонов.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = {
+            'user': User.objects.create(
+                username='reader', email='reader@example.com',
+                first_name='Имя', last_name='Фамилия', password='password'
+            ),
+            'admin': User.objects.create(
+                username='admin', email='admin@example.com',
+                first_name='Имя', last_name='Фамилия', password='password',
+                is_staff=True, is_superuser=True, is_admin=True
+            ),
+        }
+        cls.tags = [
+            Tag.objects.create(name=f'Тег {number}', slug=f'tag{number}')
+            for number in range(3)
+        ]
+        cls.ingredients = [
+            Ingredient.objects.create(
+                name=f'Ингредиент {number}', measurement_unit='г'
+            )
+            for number in range(8)
+        ]
+
+    def grow(self, size):
+        """Авторы с рецептами, на которых подписаны все пользователи."""
+
+        for number in range(Recipe.objects.count(), size):
+            author = User.objects.create(
+                username=f'author{number}',
+                email=f'author{number}@example.com',
+                first_name='Имя', last_name='Фамилия', password='password'
+            )
+            recipe = Recipe.objects.create(
+                name=f'Рецепт {number}', text='Описание',
+                author=author, cooking_time=10
+            )
+            recipe.tags.set(self.tags)
+            RecipeIngredient.objects.bulk_create(
+                RecipeIngredient(recipe=recipe, ingredient=ingredient,
+                                 amount=number + 1)
+                for ingredient in self.ingredients
+            )
+            for user in self.users.values():
+                Follow.objects.create(user=user, author=author)
+                Favorite.objects.create(user=user, recipe=recipe)
+                ShoppingCart.objects.create(user=user, recipe=recipe)
+
+    def capture(self, role, url, params):
+        caches['default'].clear()
+        self.client.force_authenticate(self.users.get(role))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        return response, [query['sql'] for query in queries.captured_queries]
+
+    def assert_budget(self, url, *variants,
+                      anonymous_status=status.HTTP_200_OK):
+        expected_status = {
+            'anonymous': anonymous_status,
+            'user': status.HTTP_200_OK,
+            'admin': status.HTTP_200_OK,
+        }
+        cases = [(role, params) for params in variants for role in ROLES]
+        self.grow(SMALL)
+        small = [self.capture(role, url, params) for role, params in cases]
+        self.grow(LARGE)
+        for (role, params), (_, expected) in zip(cases, small):
+            with self.subTest(role=role, **params):
+                response, large = self.capture(role, url, params)
+                self.assertEqual(response.status_code, expected_status[role])
+                if len(large) != len(expected):
+                    self.fail(self.report(role, url, expected, large))
+
+    @staticmethod
+    def report(role, url, small, large):
+        lines = [f'{url} ({role}): {len(small)} запросов при {SMALL} '
+                 f'объектах, {len(large)} при {LARGE}.']
+        for size, queries in ((SMALL, small), (LARGE, large)):
+            lines.append(f'Запросы при {size} объектах:')
+            lines.extend(
+                f'{number}. {sql}'
+                for number, sql in enumerate(queries, start=1)
+            )
+        return '\n'.join(lines)
+
+    def test_recipes(self):
+        self.assert_budget('/api/recipes/', {'limit': LARGE})
+
+    def test_recipes_in_shopping_cart(self):
+        self.assert_budget(
+            '/api/recipes/', {'limit': LARGE, 'is_in_shopping_cart': 1}
+        )
+
+    def test_users(self):
+        self.assert_budget('/api/users/', {'limit': LARGE * 2})
+
+    def test_subscriptions(self):
+        self.assert_budget(
+            '/api/users/subscriptions/', {'limit': LARGE, 'recipes_limit': 2},
+            anonymous_status=status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_download_shopping_cart(self):
+        self.assert_budget(
+            '/api/recipes/download_shopping_cart/',
+            *({'format': file_format}
+              for file_format in SHOPPING_LIST_RENDERERS),
+            anonymous_status=status.HTTP_401_UNAUTHORIZED
+        )
@@ -0,0 +1,105 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import (
+    Favorite,
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    ShoppingCart,
+    Tag
+)
+from users.models import Follow
+
+User = get_user_model()
+
+LIST_QUERIES = 5
+DETAIL_QUERIES = 4
+
+
+class RecipeReadQueriesTest(APITestCase):
+    """Количество запросов при чтении рецептов не зависит от их числа."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username='reader', email='reader@example.com',
+            first_name='Имя', last_name='Фамилия', password='password'
+        )
+        cls.tags = [
+            Tag.objects.create(name=f'Тег {i}', slug=f'tag-{i}')
+            for i in range(3)
+        ]
+        cls.ingredients = [
+            Ingredient.objects.create(
+                name=f'Ингредиент {i}', measurement_unit='г'
+            )
+            for i in range(10)
+        ]
+
+    def create_recipes(self, count):
+        start = Recipe.objects.count()
+        for number in range(start, start + count):
+            author = User.objects.create(
+                username=f'author-{number}',
+                email=f'author-{number}@example.com',
+                first_name='Имя', last_name='Фамилия', password='password'
+            )
+            recipe = Recipe.objects.create(
+                name=f'Рецепт {number}', text='Описание',
+                author=author, cooking_time=10
+            )
+            recipe.tags.set(self.tags)
+            RecipeIngredient.objects.bulk_create(
+                RecipeIngredient(recipe=recipe, ingredient=ingredient,
+                                 amount=number + 1)
+                for ingredient in self.ingredients
+            )
+            if number % 2:
+                Favorite.objects.create(user=self.user, recipe=recipe)
+                ShoppingCart.objects.create(user=self.user, recipe=recipe)
+                Follow.objects.create(user=self.user, author=author)
+
+    def test_list_queries_do_not_grow(self):
+        self.client.force_authenticate(self.user)
+        for count in (2, 20):
+            with self.subTest(count=count):
+                self.create_recipes(count - Recipe.objects.count())
+                with self.assertNumQueries(LIST_QUERIES):
+                    response = self.client.get(
+                        '/api/recipes/', {'limit': count}
+                    )
+                self.assertEqual(len(response.data['results']),
+                                 Recipe.objects.count())
+
+    def test_anonymous_list_queries_do_not_grow(self):
+        for count in (2, 20):
+            with self.subTest(count=count):
+                self.create_recipes(count - Recipe.objects.count())
+                with self.assertNumQueries(LIST_QUERIES):
+                    self.client.get('/api/recipes/', {'limit': count})
+
+    def test_detail_queries(self):
+        self.create_recipes(2)
+        recipe = Recipe.objects.last()
+        self.client.force_authenticate(self.user)
+        with self.assertNumQueries(DETAIL_QUERIES):
+            response = self.client.get(f'/api/recipes/{recipe.id}/')
+        self.assertTrue(response.data['is_favorited'])
+        self.assertTrue(response.data['is_in_shopping_cart'])
+        self.assertTrue(response.data['author']['is_subscribed'])
+        self.assertEqual(len(response.data['ingredients']),
+                         len(self.ingredients))
+
+    def test_write_actions_skip_read_annotations(self):
+        self.create_recipes(1)
+        recipe = Recipe.objects.get()
+        self.client.force_authenticate(recipe.author)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(f'/api/recipes/{recipe.id}/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        lookup = queries.captured_queries[0]['sql']
+        self.assertNotIn('EXISTS', lookup.upper())
@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+from api.models import Recipe
+
+User = get_user_model()
+
+
+class RecipeSearchTest(APITestCase):
+    """Полнотекстовый поиск рецептов."""
+
+    url = '/api/recipes/'
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create(
+            username='author', email='author@example.com',
+            first_name='Имя', last_name='Фамилия', password='password'
+        )
+        for name, text in (
+            ('Борщ', 'Свекла, капуста и картофель варятся в бульоне.'),
+            ('Капуста тушеная', 'Тушить на медленном огне.'),
+            ('Сырники', 'Творог смешать с яйцом и обжарить.'),
+        ):
+            Recipe.objects.create(
+                name=name, text=text, author=author, cooking_time=30
+            )
+
+    def search(self, query):
+        return self.client.get(self.url, {'search': query}).json()['results']
+
+    def test_name_hits_rank_before_text_hits(self):
+        results = self.search('капуста')
+        self.assertEqual([recipe['name'] for recipe in results],
+                         ['Капуста тушеная', 'Борщ'])
+        self.assertIn('<b>', results[1]['search_snippet'])
+
+    def test_search_finds_words_inside_text(self):
+        results = self.search('творог')
+        self.assertEqual([recipe['name'] for recipe in results], ['Сырники'])
+
+    def test_search_follows_recipe_changes(self):
+        recipe = Recipe.objects.get(name='Сырники')
+        recipe.text = 'Рецепт без молочных продуктов.'
+        recipe.save()
+        self.assertEqual(self.search('творог'), [])
+        recipe.delete()
+        self.assertEqual(self.search('молочных'), [])
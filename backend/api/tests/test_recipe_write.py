@@ -0,0 +1,115 @@
+import base64
+import shutil
+import tempfile
+from io import BytesIO
+from itertools import count
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Ingredient, Recipe, Tag
+
+User = get_user_model()
+MEDIA_ROOT = tempfile.mkdtemp()
+# Файлы хранятся по хешу содержимого: у каждого рецепта своя картинка,
+# чтобы повторная загрузка не шла по более короткому пути дедупликации.
+COLORS = count()
+
+
+def make_image():
+    buffer = BytesIO()
+    Image.new('RGB', (2, 2), next(COLORS)).save(buffer, 'PNG')
+    return 'data:image/png;base64,' + base64.b64encode(
+        buffer.getvalue()
+    ).decode()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class RecipeWriteQueriesTest(APITestCase):
+    """Запись ингредиентов рецепта пакетными запросами."""
+
+    url = '/api/recipes/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(
+            username='author', email='author@example.com',
+            first_name='Имя', last_name='Фамилия', password='password'
+        )
+        cls.tag = Tag.objects.create(name='Обед', slug='lunch')
+        cls.ingredients = [
+            Ingredient.objects.create(
+                name=f'Ингредиент {number}', measurement_unit='г'
+            )
+            for number in range(30)
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client.force_authenticate(self.author)
+
+    def payload(self, ingredients, amount=10):
+        return {
+            'ingredients': [
+                {'id': ingredient.id, 'amount': amount}
+                for ingredient in ingredients
+            ],
+            'tags': [self.tag.id],
+            'image': make_image(),
+            'name': 'Рецепт',
+            'text': 'Описание',
+            'cooking_time': 10,
+        }
+
+    def count_queries(self, method, url, payload):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(
+                url, payload, format='json'
+            )
+        self.assertIn(response.status_code,
+                      (status.HTTP_200_OK, status.HTTP_201_CREATED))
+        return len(context), response
+
+    def test_create_queries_do_not_depend_on_ingredients(self):
+        few, _ = self.count_queries(
+            'post', self.url, self.payload(self.ingredients[:2])
+        )
+        many, response = self.count_queries(
+            'post', self.url, self.payload(self.ingredients)
+        )
+        self.assertEqual(few, many)
+        self.assertEqual(len(response.data['ingredients']), 30)
+
+    def test_update_applies_only_the_difference(self):
+        _, response = self.count_queries(
+            'post', self.url, self.payload(self.ingredients[:20])
+        )
+        url = f'{self.url}{response.data["id"]}/'
+        payload = self.payload(self.ingredients[10:], amount=10)
+        payload['ingredients'][0]['amount'] = 99
+        payload['name'] = 'Новое название'
+        _, response = self.count_queries('patch', url, payload)
+        recipe = Recipe.objects.get(pk=response.data['id'])
+        self.assertEqual(recipe.name, 'Новое название')
+        self.assertEqual(
+            dict(recipe.recipeingredient_set.values_list(
+                'ingredient_id', 'amount'
+            )),
+            {ingredient['id']: ingredient['amount']
+             for ingredient in payload['ingredients']}
+        )
+
+    def test_unknown_ingredient_is_rejected(self):
+        payload = self.payload(self.ingredients[:1])
+        payload['ingredients'].append({'id': 0, 'amount': 1})
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
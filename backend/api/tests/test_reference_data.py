@@ -0,0 +1,55 @@
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Ingredient, Tag
+
+
+class ReferenceDataResponseTest(APITestCase):
+    """Готовые условные ответы для тегов и ингредиентов."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tag = Tag.objects.create(name='Завтрак', slug='breakfast')
+        cls.ingredient = Ingredient.objects.create(
+            name='соль', measurement_unit='г'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_encoded_responses_are_served_without_queries(self):
+        urls = ('/api/tags/', f'/api/tags/{self.tag.id}/',
+                '/api/ingredients/', f'/api/ingredients/{self.ingredient.id}/')
+        for url in urls:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                with self.assertNumQueries(0):
+                    second = self.client.get(url)
+                self.assertEqual(first.content, second.content)
+                self.assertEqual(first['ETag'], second['ETag'])
+                with self.assertNumQueries(0):
+                    response = self.client.get(
+                        url, HTTP_IF_NONE_MATCH=first['ETag']
+                    )
+                self.assertEqual(response.status_code,
+                                 status.HTTP_304_NOT_MODIFIED)
+
+    def test_changes_invalidate_encoded_response(self):
+        first = self.client.get('/api/tags/')
+        Tag.objects.create(name='Обед', slug='lunch')
+        response = self.client.get(
+            '/api/tags/', HTTP_IF_NONE_MATCH=first['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 2)
+
+    def test_detail_key_is_normalized(self):
+        self.client.get(f'/api/tags/{self.tag.id}/')
+        with self.assertNumQueries(0):
+            response = self.client.get(f'/api/tags/00{self.tag.id}/')
+        self.assertEqual(response.json()['slug'], 'breakfast')
+        self.assertEqual(
+            self.client.get('/api/tags/abc/').status_code,
+            status.HTTP_404_NOT_FOUND
+        )
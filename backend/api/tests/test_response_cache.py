@@ -0,0 +1,107 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from api.models import Recipe, Tag
+from api.response_cache import get_or_build
+
+User = get_user_model()
+
+
+class RecipeListCacheTest(APITestCase):
+    """Общий кеш списка рецептов для анонимных пользователей."""
+
+    url = '/api/recipes/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(
+            username='author', email='author@example.com',
+            first_name='Имя', last_name='Фамилия', password='password'
+        )
+        cls.lunch = Tag.objects.create(name='Обед', slug='lunch')
+        cls.dinner = Tag.objects.create(name='Ужин', slug='dinner')
+        cls.recipe = Recipe.objects.create(
+            author=cls.author, name='Рецепт', text='Описание',
+            cooking_time=10
+        )
+        cls.recipe.tags.set([cls.lunch, cls.dinner])
+
+    def setUp(self):
+        caches[settings.RECIPE_LIST_CACHE].clear()
+
+    def test_normalized_query_is_served_from_cache(self):
+        first = self.client.get(
+            f'{self.url}?tags=lunch&tags=dinner&limit=6'
+        )
+        with self.assertNumQueries(0):
+            second = self.client.get(
+                f'{self.url}?limit=6&tags=dinner&tags=lunch'
+            )
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(second.json()['count'], 1)
+
+    def test_changes_invalidate_cache(self):
+        self.client.get(self.url)
+        self.recipe.tags.remove(self.dinner)
+        response = self.client.get(self.url, {'tags': 'dinner'})
+        self.assertEqual(response.json()['count'], 0)
+        self.client.get(self.url)
+        self.lunch.name = 'Второй завтрак'
+        self.lunch.save()
+        response = self.client.get(self.url)
+        self.assertEqual(
+            response.json()['results'][0]['tags'][0]['name'],
+            'Второй завтрак'
+        )
+
+    def test_authenticated_requests_are_not_cached(self):
+        self.client.force_authenticate(self.author)
+        self.client.get(self.url)
+        with self.assertNumQueries(5):
+            self.client.get(self.url)
+
+    def test_file_based_cache(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': location,
+        }}):
+            first = self.client.get(self.url)
+            with self.assertNumQueries(0):
+                second = self.client.get(self.url)
+        self.assertEqual(first.content, second.content)
+
+
+class GetOrBuildTest(APITestCase):
+    """Защита от одновременного пересчета одного ключа."""
+
+    def setUp(self):
+        self.cache = caches['default']
+        self.cache.clear()
+
+    def test_waits_for_value_built_by_lock_holder(self):
+        self.cache.add('key:lock', 1)
+        build = mock.Mock(return_value=b'own')
+
+        def other_worker_finishes(seconds):
+            self.cache.set('key', b'shared')
+
+        with mock.patch('api.response_cache.time.sleep',
+                        side_effect=other_worker_finishes):
+            value = get_or_build(self.cache, 'key', build, 60)
+        self.assertEqual(value, b'shared')
+        build.assert_not_called()
+
+    def test_failed_build_is_not_cached(self):
+        self.assertIsNone(get_or_build(self.cache, 'key', lambda: None, 60))
+        self.assertIsNone(self.cache.get('key:lock'))
+        self.assertEqual(get_or_build(self.cache, 'key', lambda: b'v', 60),
+                         b'v')
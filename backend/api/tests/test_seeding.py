@@ -0,0 +1,46 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db.models import F
+from django.test import TestCase
+
+from api.counters import COUNTERS, find_drift
+from api.models import Favorite, Recipe, RecipeIngredient
+from users.models import Follow
+
+User = get_user_model()
+
+
+class SeedScaleTest(TestCase):
+    """Генерация синтетических данных командой seed_scale."""
+
+    def seed(self, *args):
+        call_command('seed_scale', *args, stdout=StringIO())
+
+    def test_small_scale(self):
+        self.seed('0.02', '--seed', '7')
+        self.assertEqual(Recipe.objects.count(), 200)
+        self.assertGreater(RecipeIngredient.objects.count(), 400)
+        self.assertTrue(Favorite.objects.exists())
+        self.assertFalse(Follow.objects.filter(
+            user_id=F('author_id')
+        ).exists())
+        for counter in COUNTERS:
+            self.assertEqual(find_drift(*counter), 0)
+
+    def test_same_seed_gives_same_data(self):
+        self.seed('0.01', '--seed', '3')
+        names = list(Recipe.objects.order_by('id').values_list(
+            'name', 'author__username'
+        ))
+        User.objects.filter(username__startswith='seed3_').delete()
+        self.seed('0.01', '--seed', '3')
+        self.assertEqual(names, list(Recipe.objects.order_by(
+            'id'
+        ).values_list('name', 'author__username')))
+
+    def test_same_seed_is_rejected(self):
+        self.seed('0.01')
+        with self.assertRaises(CommandError):
+            self.seed('0.01')
@@ -0,0 +1,173 @@
+import json
+import os
+import time
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Ingredient, Recipe, RecipeIngredient, ShoppingCart
+from api.shopping_list import (
+    SHOPPING_LIST_RENDERERS,
+    get_shopping_list,
+    open_cached
+)
+from api.tests.mixins import ShoppingListFilesMixin
+
+User = get_user_model()
+
+
+class ShoppingListTest(TestCase):
+    """Суммирование ингредиентов из списка покупок."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.other = (
+            User.objects.create(
+                username=name, email=f'{name}@example.com',
+                first_name='Имя', last_name='Фамилия', password='password'
+            )
+            for name in ('buyer', 'other')
+        )
+        cls.salt = Ingredient.objects.create(name='соль', measurement_unit='г')
+        cls.milk = Ingredient.objects.create(
+            name='молоко', measurement_unit='мл'
+        )
+        for amount, buyers in ((10, [cls.user]), (5, [cls.user, cls.other]),
+                               (100, [cls.other])):
+            recipe = Recipe.objects.create(
+                name=f'Рецепт {amount}', text='Описание',
+                author=cls.other, cooking_time=10
+            )
+            RecipeIngredient.objects.create(
+                recipe=recipe, ingredient=cls.salt, amount=amount
+            )
+            RecipeIngredient.objects.create(
+                recipe=recipe, ingredient=cls.milk, amount=amount * 2
+            )
+            for buyer in buyers:
+                ShoppingCart.objects.create(user=buyer, recipe=recipe)
+
+    def test_totals_include_only_user_cart(self):
+        with self.assertNumQueries(1):
+            shopping_list = list(get_shopping_list(self.user))
+        self.assertEqual(shopping_list, [
+            {'id': self.milk.id, 'name': 'молоко',
+             'measurement_unit': 'мл', 'amount': 30},
+            {'id': self.salt.id, 'name': 'соль',
+             'measurement_unit': 'г', 'amount': 15},
+        ])
+
+    def test_empty_cart(self):
+        ShoppingCart.objects.filter(user=self.user).delete()
+        self.assertEqual(list(get_shopping_list(self.user)), [])
+
+
+class ShoppingListDownloadCacheTest(ShoppingListFilesMixin, APITestCase):
+    """Кеширование выгрузки списка покупок."""
+
+    url = '/api/recipes/download_shopping_cart/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username='buyer', email='buyer@example.com',
+            first_name='Имя', last_name='Фамилия', password='password'
+        )
+        cls.salt = Ingredient.objects.create(name='соль', measurement_unit='г')
+        cls.recipe = Recipe.objects.create(
+            name='Рецепт', text='Описание', author=cls.user, cooking_time=10
+        )
+        cls.recipe_ingredient = RecipeIngredient.objects.create(
+            recipe=cls.recipe, ingredient=cls.salt, amount=10
+        )
+        ShoppingCart.objects.create(user=cls.user, recipe=cls.recipe)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.user)
+
+    def cached_files(self):
+        return sorted(os.listdir(
+            os.path.join(self.shopping_list_root, str(self.user.pk))
+        ))
+
+    def download(self, **headers):
+        response = self.client.get(self.url, {'format': 'txt'}, **headers)
+        content = b''.join(getattr(response, 'streaming_content', []))
+        return response, content.decode()
+
+    def test_repeat_download_is_not_modified(self):
+        response, content = self.download()
+        self.assertIn('- соль: 10,г.', content)
+        with self.assertNumQueries(0):
+            cached, _ = self.download(HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_cart_changes_invalidate_cache(self):
+        response, _ = self.download()
+        self.recipe_ingredient.amount = 25
+        self.recipe_ingredient.save()
+        changed, content = self.download(HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertIn('- соль: 25,г.', content)
+        ShoppingCart.objects.filter(user=self.user).delete()
+        _, content = self.download(HTTP_IF_NONE_MATCH=changed['ETag'])
+        self.assertNotIn('соль', content)
+        self.assertEqual(len(self.cached_files()), 1)
+
+    def test_file_is_reused(self):
+        self.download()
+        with patch.dict(SHOPPING_LIST_RENDERERS, txt=(None, 'text/plain')):
+            _, content = self.download()
+        self.assertIn('- соль: 10,г.', content)
+        self.assertEqual(len(self.cached_files()), 1)
+
+    def test_unsupported_format(self):
+        for params, headers in (
+            ({'format': 'xml'}, {}),
+            ({'format': 'api'}, {'HTTP_ACCEPT': 'text/html'}),
+        ):
+            with self.subTest(**params, **headers):
+                response = self.client.get(self.url, params, **headers)
+                self.assertEqual(response.status_code,
+                                 status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(response['Content-Type'], 'application/json')
+                self.assertIn('pdf, txt, csv, json', response.json()['detail'])
+
+    def test_accept_header_does_not_change_format(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='application/xml')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+
+    def test_pdf_download(self):
+        response = self.client.get(self.url, {'format': 'pdf'})
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        content = b''.join(response.streaming_content)
+        self.assertTrue(content.startswith(b'%PDF'))
+
+    def test_concurrent_versions_keep_open_files(self):
+        with open_cached(self.user.pk, 'new', 'txt') as newer:
+            path = os.path.join(
+                self.shopping_list_root, str(self.user.pk), 'new.txt'
+            )
+            later = time.time() + 60
+            os.utime(path, (later, later))
+            # Запрос со старой версией закончил рендер позже.
+            open_cached(self.user.pk, 'old', 'txt').close()
+            self.assertTrue(os.path.exists(path))
+            self.assertIn('соль', newer.read().decode())
+        with open_cached(self.user.pk, 'first', 'txt') as first:
+            open_cached(self.user.pk, 'second', 'txt').close()
+            self.assertIn('соль', first.read().decode())
+
+    def test_json_download(self):
+        response = self.client.get(self.url, {'format': 'json'})
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(
+            json.loads(b''.join(response.streaming_content)),
+            [{'id': self.salt.pk, 'name': 'соль', 'measurement_unit': 'г',
+              'amount': 10}]
+        )
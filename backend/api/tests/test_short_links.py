@@ -0,0 +1,74 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.models import Recipe
+from api.short_links import decode, encode, existing_recipe, hit_counter
+
+User = get_user_model()
+
+
+class ShortLinkTest(TestCase):
+    """Короткие ссылки на рецепты."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(
+            username='author', email='author@example.com',
+            first_name='Имя', last_name='Фамилия', password='password'
+        )
+        cls.recipe = Recipe.objects.create(
+            author=cls.author, name='Рецепт', text='Описание',
+            cooking_time=10
+        )
+
+    def setUp(self):
+        existing_recipe.cache_clear()
+        hit_counter.hits.clear()
+        # Фоновая запись идет через другое соединение с базой данных.
+        patcher = mock.patch.object(hit_counter, 'interval', float('inf'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_codes_round_trip(self):
+        for number in (0, 61, 62, 10 ** 12):
+            self.assertEqual(decode(encode(number)), number)
+        self.assertEqual(encode(61), 'Z')
+        for code in ('', '0a', 'a-b'):
+            with self.assertRaises(ValueError):
+                decode(code)
+
+    def test_get_link_returns_code(self):
+        response = APIClient().get(f'/api/recipes/{self.recipe.pk}/get-link/')
+        self.assertEqual(
+            response.data['short-link'],
+            f'http://testserver/r/{encode(self.recipe.pk)}/'
+        )
+
+    def test_redirect_is_cached_and_counted(self):
+        url = f'/r/{encode(self.recipe.pk)}/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], f'/recipes/{self.recipe.pk}')
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        hit_counter.flush()
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.short_link_hits, 2)
+
+    def test_unknown_code(self):
+        self.assertEqual(self.client.get('/r/zzzz/').status_code, 404)
+        self.assertEqual(self.client.get('/r/a-b/').status_code, 404)
+
+    def test_legacy_link_redirects_by_id(self):
+        # Код '10' в base62 — это 62; старая ссылка ведет на рецепт 10.
+        recipe = Recipe.objects.create(
+            pk=10, author=self.author, name='Рецепт', text='Описание',
+            cooking_time=10
+        )
+        response = self.client.get(f'/s/{recipe.pk}/')
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], f'/recipes/{recipe.pk}')
+        self.assertEqual(self.client.get('/s/999/').status_code, 404)
@@ -0,0 +1,105 @@
+import shutil
+import tempfile
+from io import BytesIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from api.images import IMAGE_VARIANTS, process_upload, variant_name
+from api.models import MediaFile, Recipe
+
+User = get_user_model()
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ContentAddressedStorageTest(TestCase):
+    """Хранение медиафайлов по хешу содержимого с подсчетом ссылок."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(
+            username='author', email='author@example.com',
+            first_name='Имя', last_name='Фамилия', password='password'
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        # Содержимое файлов здесь — не изображения, варианты не строятся.
+        patcher = patch('api.signals.schedule_variants')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_recipe(self, content=b'image'):
+        recipe = Recipe(
+            author=self.author, name='Рецепт', text='Описание',
+            cooking_time=10
+        )
+        recipe.image.save('photo.JPG', ContentFile(content), save=False)
+        recipe.save()
+        return recipe
+
+    def test_same_content_is_stored_once(self):
+        first = self.create_recipe()
+        second = self.create_recipe()
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertRegex(
+            first.image.name,
+            r'^recipe_images/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$'
+        )
+        self.assertEqual(
+            MediaFile.objects.get(name=first.image.name).references, 2
+        )
+
+    def test_file_removed_with_last_reference(self):
+        first = self.create_recipe()
+        second = self.create_recipe()
+        name = first.image.name
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(default_storage.exists(name))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(default_storage.exists(name))
+        self.assertFalse(MediaFile.objects.filter(name=name).exists())
+
+    def test_replaced_image_releases_old_file(self):
+        recipe = self.create_recipe(b'old')
+        old_name = recipe.image.name
+        recipe.image.save('photo.jpg', ContentFile(b'new'), save=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.save()
+        self.assertFalse(default_storage.exists(old_name))
+        self.assertEqual(
+            MediaFile.objects.get(name=recipe.image.name).references, 1
+        )
+
+    def test_upload_before_delete_keeps_file(self):
+        recipe = self.create_recipe()
+        name = recipe.image.name
+        with self.captureOnCommitCallbacks() as callbacks:
+            recipe.delete()
+        self.create_recipe()
+        for callback in callbacks:
+            callback()
+        self.assertTrue(default_storage.exists(name))
+        self.assertEqual(MediaFile.objects.get(name=name).references, 1)
+
+    def test_upload_is_saved_with_variants(self):
+        buffer = BytesIO()
+        Image.new('RGB', (1200, 800), 'red').save(buffer, 'JPEG')
+        name = default_storage.save(
+            'recipe_images/image.jpg', process_upload(buffer.getvalue())
+        )
+        for variant in IMAGE_VARIANTS:
+            self.assertTrue(
+                default_storage.exists(variant_name(name, variant))
+            )
@@ -1,16 +1,12 @@
-import io
-import os
-
-from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from django.http import FileResponse
-from django.shortcuts import get_object_or_404
+from django.http import FileResponse, HttpResponseNotModified
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
 from django.contrib.auth import get_user_model
-from django.db.models import Prefetch, Sum
+from django.utils.http import parse_etags, quote_etag
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.decorators import action
 
@@ -24,14 +20,25 @@ from .serializers import (
     ShoppingCartSerializer,
     FavoriteSerializer
 )
+from .db_documents import DatabaseDocumentsMixin
+from .fast_read import FastReadMixin
 from .filters import IngredientFilter, RecipeFilter
+from .ingredient_index import ingredient_index
+from .negotiation import FileDownloadNegotiation
 from .paginations import LimitPagination
-from backend.constants import X_CORD, Y_CORD, LINE_STEP
+from .reference_data import EncodedReferenceMixin
+from .response_cache import AnonymousListCacheMixin
+from .short_links import encode, existing_recipe, hit_counter, resolve
+from .shopping_list import (
+    SHOPPING_LIST_RENDERERS,
+    get_cart_version,
+    open_cached
+)
 
 User = get_user_model()
 
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TagViewSet(EncodedReferenceMixin, viewsets.ReadOnlyModelViewSet):
     """Вьюсет для работы с тегами."""
 
     serializer_class = TagSerializer
@@ -39,7 +46,8 @@ class TagViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = None
 
 
-class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
+class IngredientViewSet(EncodedReferenceMixin,
+                        viewsets.ReadOnlyModelViewSet):
     """Вьюсет для работы с ингредиентами."""
 
     serializer_class = IngredientSerializer
@@ -48,8 +56,17 @@ class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [DjangoFilterBackend]
     filterset_class = IngredientFilter
 
+    def list(self, request, *args, **kwargs):
+        """Поиск по индексу в памяти, полный список из готового JSON."""
+
+        name = request.query_params.get('name')
+        if name:
+            return Response(ingredient_index.search(name))
+        return super().list(request, *args, **kwargs)
 
-class RecipeViewSet(viewsets.ModelViewSet):
+
+class RecipeViewSet(AnonymousListCacheMixin, DatabaseDocumentsMixin,
+                    FastReadMixin, viewsets.ModelViewSet):
     """Вьюсет для работы с рецептами."""
 
     serializer_class = RecipeReadSerializer
@@ -58,12 +75,28 @@ class RecipeViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend]
     filterset_class = RecipeFilter
     pagination_class = LimitPagination
+    cursor_ordering = ('created_at', 'id')
+    fast_read_setting = 'RECIPE_FAST_READ'
+    db_documents_setting = 'RECIPE_DB_DOCUMENTS'
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve'):
+            return queryset.for_read(self.request.user)
+        return queryset
+
+    def read_object(self, pk):
+        """Рецепт со всеми данными для ответа после записи."""
+
+        return Recipe.objects.for_read(self.request.user).get(pk=pk)
 
     def create(self, request, *args, **kwargs):
         input_serializer = RecipeWriteSerializer(data=request.data)
         if input_serializer.is_valid():
             resipe = input_serializer.save(author=request.user)
-            output_serializer = RecipeReadSerializer(resipe)
+            output_serializer = RecipeReadSerializer(
+                self.read_object(resipe.pk)
+            )
             return Response(
                 output_serializer.data,
                 status=status.HTTP_201_CREATED
@@ -79,7 +112,9 @@ class RecipeViewSet(viewsets.ModelViewSet):
             recipe, data=request.data, partial=True)
         if input_serializer.is_valid():
             resipe = input_serializer.save()
-            output_serializer = RecipeReadSerializer(resipe)
+            output_serializer = RecipeReadSerializer(
+                self.read_object(resipe.pk)
+            )
             return Response(
                 output_serializer.data, status=status.HTTP_200_OK
             )
@@ -165,63 +200,37 @@ class RecipeViewSet(viewsets.ModelViewSet):
     @action(
         methods=['get'],
         detail=False,
-        url_path='download_shopping_cart'
+        url_path='download_shopping_cart',
+        permission_classes=[IsAuthenticated],
+        renderer_classes=[JSONRenderer],
+        content_negotiation_class=FileDownloadNegotiation
     )
     def download_shopping_cart(self, request, *args, **kwargs):
         """Скачивание списка покупок."""
 
-        user = self.request.user
-        shopping_list = ShoppingCart.objects.filter(
-            user=user
-        ).prefetch_related(
-            Prefetch(
-                'recipe__ingredients',
-                queryset=Ingredient.objects.annotate(
-                    amount=Sum('recipeingredient__amount')
-                )
+        file_format = request.query_params.get('format', 'pdf')
+        if file_format not in SHOPPING_LIST_RENDERERS:
+            return Response(
+                {'detail': f'Неподдерживаемый формат: {file_format}. '
+                           f'Доступны: {", ".join(SHOPPING_LIST_RENDERERS)}.'},
+                status=status.HTTP_400_BAD_REQUEST
             )
-        )
-        ingredients = {}
-        for recipe in shopping_list:
-            for item in recipe.recipe.ingredients.all():
-                if item in ingredients:
-                    ingredients[item.name]['amount'] += item.amount
-                else:
-                    ingredients[item.name] = {
-                        'amount': item.amount,
-                        'measurement_unit': item.measurement_unit
-                    }
-        buffer = io.BytesIO()
-        x = X_CORD
-        y = Y_CORD
-        pdf_object = canvas.Canvas(buffer)
-        header_font_file = os.path.abspath(os.path.join(
-            '..', 'backend',
-            'pdf_fonts', 'Verdana-Bold.ttf'
-        ))
-        pdfmetrics.registerFont(
-            TTFont('Verdana-Bold', header_font_file)
-        )
-        font_file = os.path.abspath(os.path.join(
-            '..', 'backend',
-            'pdf_fonts', 'Verdana.ttf'
-        ))
-        pdfmetrics.registerFont(TTFont('Verdana', font_file))
-        pdf_object.setFont('Verdana-Bold', 16)
-        pdf_object.drawString(x, y, 'Список покупок:')
-        pdf_object.setFont('Verdana', 12)
-        for ingredient in ingredients:
-            y -= LINE_STEP
-            amount = ingredients[ingredient]['amount']
-            measurement_unit = ingredients[ingredient]['measurement_unit']
-            pdf_object.drawString(
-                x, y, f'- {ingredient}: {amount},{measurement_unit}.')
-        pdf_object.showPage()
-        pdf_object.save()
-        buffer.seek(0)
-        return FileResponse(
-            buffer, as_attachment=True, filename='shopping_cart.pdf'
-        )
+        user_id = self.request.user.id
+        version = get_cart_version(user_id)
+        etag = quote_etag(f'{version}-{file_format}')
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+        else:
+            _, content_type = SHOPPING_LIST_RENDERERS[file_format]
+            response = FileResponse(
+                open_cached(user_id, version, file_format),
+                as_attachment=True,
+                filename=f'shopping_cart.{file_format}',
+                content_type=content_type
+            )
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
 
     @action(
         methods=['get'],
@@ -231,7 +240,24 @@ class RecipeViewSet(viewsets.ModelViewSet):
     def gen_short_link(self, request, *args, **kwargs):
         """Генерация короткой ссылки."""
 
-        link = kwargs['pk']
-        full_link = request.build_absolute_uri()
-        base_link = '/'.join(full_link.split('/')[:3]) + '/'
-        return Response({'short-link': f'{base_link}s/{link}/'})
+        recipe = get_object_or_404(Recipe.objects.only('id'), pk=kwargs['pk'])
+        return Response({'short-link': request.build_absolute_uri(
+            reverse('short_link', args=[encode(recipe.pk)])
+        )})
+
+
+def recipe_redirect(pk):
+    hit_counter.record(pk)
+    return redirect(f'/recipes/{pk}')
+
+
+def short_link_redirect(request, code):
+    """Переход по короткой ссылке на страницу рецепта во фронтенде."""
+
+    return recipe_redirect(resolve(code))
+
+
+def legacy_short_link_redirect(request, pk):
+    """Переход по старой короткой ссылке /s/<id>/, выданной до кодов."""
+
+    return recipe_redirect(existing_recipe(pk))
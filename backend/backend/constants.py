@@ -3,11 +3,31 @@ MEUSERNAME = 'me'
 X_CORD = 100
 Y_CORD = 750
 LINE_STEP = 15
+Y_CORD_MIN = 50
+STREAM_CHUNK_LINES = 100
+# PDF больше этого размера временный файл сбрасывает на диск.
+PDF_SPOOL_MAX_SIZE = 1024 * 1024
 
 EMAIL_LEN = 254
 NAME_LEN = 150
 
 MEASURENT_LEN = 64
+INGREDIENT_SEARCH_LIMIT = 50
 SLUG_LEN = 32
 
 RECIPE_NAME_LEN = 255
+
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+MAX_IMAGE_PIXELS = 24_000_000
+IMAGE_QUALITY = 85
+IMAGE_VARIANTS = {
+    'thumbnail': (160, 160),
+    'card': (480, 480),
+    'full': (1600, 1600),
+}
+
+SHORT_LINK_CACHE_SIZE = 10_000
+SHORT_LINK_FLUSH_SECONDS = 10
+
+RESPONSE_CACHE_LOCK_SECONDS = 10
+RESPONSE_CACHE_POLL_SECONDS = 0.05
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 import os
+import tempfile
 from pathlib import Path
 from django.core.management.utils import get_random_secret_key
 
@@ -55,6 +56,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.profiling.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -107,6 +109,36 @@ DATABASES = {
 # }
 
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'foodgram'),
+    }
+}
+
+SHOPPING_LIST_CACHE = os.getenv('SHOPPING_LIST_CACHE', 'default')
+SHOPPING_LIST_CACHE_TIMEOUT = int(
+    os.getenv('SHOPPING_LIST_CACHE_TIMEOUT', 60 * 60 * 24)
+)
+# Готовые файлы списка покупок хранятся на локальном диске, через кеш
+# SHOPPING_LIST_CACHE проходят только версии корзин. При нескольких
+# контейнерах backend кеш должен быть общим (не locmem), а папка —
+# общим томом; иначе каждый процесс ведет свои версии и файлы.
+SHOPPING_LIST_ROOT = os.getenv(
+    'SHOPPING_LIST_ROOT',
+    os.path.join(tempfile.gettempdir(), 'foodgram_shopping_lists')
+)
+RECIPE_LIST_CACHE = os.getenv('RECIPE_LIST_CACHE', 'default')
+RECIPE_LIST_CACHE_TIMEOUT = int(os.getenv('RECIPE_LIST_CACHE_TIMEOUT', 300))
+# Список рецептов без сериализаторов DRF (api.fast_read).
+RECIPE_FAST_READ = os.getenv('RECIPE_FAST_READ') == 'True'
+# Документы рецептов из PostgreSQL (api.db_documents).
+RECIPE_DB_DOCUMENTS = os.getenv('RECIPE_DB_DOCUMENTS') == 'True'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -150,6 +182,30 @@ AUTH_USER_MODEL = 'users.User'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+DEFAULT_FILE_STORAGE = 'api.storage.ContentAddressedStorage'
+
+IMAGE_WORKERS = int(os.getenv('IMAGE_WORKERS', 2))
+
+REQUEST_PROFILING = os.getenv('REQUEST_PROFILING') == 'True'
+REQUEST_PROFILING_MAX_QUERIES = int(
+    os.getenv('REQUEST_PROFILING_MAX_QUERIES', 30)
+)
+REQUEST_PROFILING_MAX_MS = int(os.getenv('REQUEST_PROFILING_MAX_MS', 500))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api.profiling': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
@@ -1,15 +1,13 @@
 from django.contrib import admin
 from django.urls import include, path
-from rest_framework import routers
 from djoser.views import TokenCreateView, TokenDestroyView
 
-from api.views import RecipeViewSet
-
-router = routers.DefaultRouter()
-router.register('s', RecipeViewSet, basename='shorl_link')
+from api.views import legacy_short_link_redirect, short_link_redirect
 
 urlpatterns = [
-    path('', include(router.urls)),
+    path('r/<str:code>/', short_link_redirect, name='short_link'),
+    path('s/<int:pk>/', legacy_short_link_redirect,
+         name='legacy_short_link'),
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
     path('api/users/', include('users.urls')),
@@ -12,9 +12,10 @@ class FollowAdmin(admin.ModelAdmin):
     list_display = ('user', 'author', 'get_follow_count')
     list_display_links = ('user', 'author')
     list_filter = ('user',)
+    list_select_related = ('user', 'author')
 
     def get_follow_count(self, obj):
-        return obj.user.follow.count()
+        return obj.user.following_count
     get_follow_count.short_description = 'Количество подписок'
 
 
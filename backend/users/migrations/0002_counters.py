@@ -0,0 +1,56 @@
+# Generated by Django 3.2.3 on 2026-10-18 12:00
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_related(apps, target, field, source, foreign_key):
+    Target = apps.get_model(*target.split('.'))
+    Source = apps.get_model(*source.split('.'))
+    Target.objects.update(**{field: Coalesce(Subquery(
+        Source.objects.filter(
+            **{foreign_key: OuterRef('pk')}
+        ).order_by().values(foreign_key).annotate(
+            count=Count('pk')
+        ).values('count')
+    ), Value(0))})
+
+
+def fill_counters(apps, schema_editor):
+    count_related(apps, 'users.User', 'recipes_count', 'api.Recipe', 'author')
+    count_related(apps, 'users.User', 'followers_count', 'users.Follow', 'author')
+    count_related(apps, 'users.User', 'following_count', 'users.Follow', 'user')
+    count_related(apps, 'users.User', 'shopping_cart_count', 'api.ShoppingCart', 'user')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_counters'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Подписчиков'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Подписок'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='recipes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Рецептов'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='shopping_cart_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Рецептов в списке покупок'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -50,6 +50,18 @@ class User(AbstractUser):
     is_admin = models.BooleanField(
         default=False, verbose_name='Админ'
     )
+    recipes_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Рецептов'
+    )
+    followers_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Подписчиков'
+    )
+    following_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Подписок'
+    )
+    shopping_cart_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Рецептов в списке покупок'
+    )
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
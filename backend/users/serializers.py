@@ -1,27 +1,26 @@
 import re
-import base64
 
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from django.core.files.base import ContentFile
 
 from backend.constants import MEUSERNAME
 from .models import Follow
+from api.fields import Base64ImageField, ImageVariantsField
 from api.models import Recipe
 
 
 User = get_user_model()
 
 
-class Base64ImageField(serializers.ImageField):
-    def to_internal_value(self, data):
-        if isinstance(data, str) and data.startswith('data:image'):
-            format, imgstr = data.split(';base64,')
-            ext = format.split('/')[-1]
+def get_recipes_limit(request):
+    """Значение параметра recipes_limit или None."""
 
-            data = ContentFile(base64.b64decode(imgstr), name='temp.' + ext)
-
-        return super().to_internal_value(data)
+    if request is None:
+        return None
+    limit = request.query_params.get('recipes_limit')
+    if limit and limit.isdigit():
+        return int(limit)
+    return None
 
 
 class UserCreateSerializer(serializers.ModelSerializer):
@@ -85,6 +84,7 @@ class UserCreateSerializer(serializers.ModelSerializer):
 class UserSerializer(serializers.ModelSerializer):
     is_subscribed = serializers.SerializerMethodField()
     avatar = Base64ImageField(required=False, allow_null=True)
+    avatar_variants = ImageVariantsField(source='avatar')
 
     class Meta:
         model = User
@@ -95,7 +95,8 @@ class UserSerializer(serializers.ModelSerializer):
             'is_subscribed',
             'first_name',
             'last_name',
-            'avatar'
+            'avatar',
+            'avatar_variants'
         ]
         read_only_fields = [
             'id',
@@ -104,13 +105,17 @@ class UserSerializer(serializers.ModelSerializer):
             'is_subscribed',
             'first_name',
             'last_name',
-            'avatar'
+            'avatar',
+            'avatar_variants'
         ]
 
     def get_is_subscribed(self, obj):
         request = self.context.get('request')
         if request is None or request.user.is_anonymous:
             return False
+        is_subscribed = getattr(obj, 'is_subscribed', None)
+        if is_subscribed is not None:
+            return is_subscribed
         return Follow.objects.filter(
             user=request.user, author=obj
         ).exists()
@@ -153,14 +158,17 @@ class AvatarSerializer(serializers.ModelSerializer):
 
 class RecipeSmallSerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField(source='image')
 
     class Meta:
         model = Recipe
-        fields = ['id', 'name', 'image', 'cooking_time']
+        fields = ['id', 'name', 'image', 'image_variants', 'cooking_time']
 
     def get_image(self, obj):
+        if not obj.image:
+            return None
         request = self.context.get('request')
-        return request.build_absolute_uri(obj.image.name)
+        return request.build_absolute_uri(obj.image.url)
 
 
 class SubscribeSerializer(serializers.ModelSerializer):
@@ -195,27 +203,24 @@ class SubscribeSerializer(serializers.ModelSerializer):
 
     def get_is_subscribed(self, obj):
         request = self.context.get('request')
-        if request is None or request.user.is_anonymous:
-            return False
-        if request.user == obj.author:
-            return False
-        return Follow.objects.filter(
-            user=request.user, author=obj.author
-        ).exists()
+        return request is not None and obj.user_id == request.user.id
 
     def get_recipes(self, obj):
-        request = self.context.get('request')
-        recipes = Recipe.objects.filter(author=obj.author)
-        limit = request.query_params.get('recipes_limit')
-        if limit:
-            recipes = recipes[:int(limit)]
+        previews = self.context.get('recipe_previews')
+        if previews is not None:
+            recipes = previews.get(obj.author_id, [])
+        else:
+            recipes = Recipe.objects.filter(author=obj.author)
+            limit = get_recipes_limit(self.context.get('request'))
+            if limit is not None:
+                recipes = recipes[:limit]
         return RecipeSmallSerializer(
             recipes, many=True,
             context={'request': self.context.get('request')}
         ).data
 
     def get_recipes_count(self, obj):
-        return Recipe.objects.filter(author=obj.author).count()
+        return obj.author.recipes_count
 
 
 class TokenSerializer(serializers.ModelSerializer):
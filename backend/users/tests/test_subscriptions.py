@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+from api.models import Recipe
+from users.models import Follow
+
+User = get_user_model()
+
+SUBSCRIPTIONS_QUERIES = 3
+
+
+class SubscriptionsQueriesTest(APITestCase):
+    """Список подписок загружается фиксированным числом запросов."""
+
+    url = '/api/users/subscriptions/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username='reader', email='reader@example.com',
+            first_name='Имя', last_name='Фамилия', password='password'
+        )
+
+    def create_authors(self, count):
+        start = Follow.objects.count()
+        for number in range(start, start + count):
+            author = User.objects.create(
+                username=f'author-{number}',
+                email=f'author-{number}@example.com',
+                first_name='Имя', last_name='Фамилия', password='password'
+            )
+            for index in range(number % 5):
+                Recipe.objects.create(
+                    name=f'Рецепт {index}', text='Описание',
+                    author=author, cooking_time=10
+                )
+            Follow.objects.create(user=self.user, author=author)
+
+    def test_queries_do_not_grow_with_page_size(self):
+        self.client.force_authenticate(self.user)
+        for count in (3, 30):
+            with self.subTest(count=count):
+                self.create_authors(count - Follow.objects.count())
+                with self.assertNumQueries(SUBSCRIPTIONS_QUERIES):
+                    response = self.client.get(
+                        self.url, {'limit': count, 'recipes_limit': 2}
+                    )
+                for author in response.data['results']:
+                    self.assertTrue(author['is_subscribed'])
+                    self.assertEqual(
+                        author['recipes_count'],
+                        Recipe.objects.filter(author_id=author['id']).count()
+                    )
+                    self.assertEqual(len(author['recipes']),
+                                     min(author['recipes_count'], 2))
@@ -1,5 +1,6 @@
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
+from django.db import transaction
 
 from rest_framework import viewsets, status
 from rest_framework.response import Response
@@ -11,8 +12,10 @@ from .serializers import (
     AvatarSerializer,
     UserCreateSerializer,
     UserSerializer,
-    SubscribeSerializer
+    SubscribeSerializer,
+    get_recipes_limit
 )
+from api.models import Recipe, with_subscription_flag
 from api.paginations import LimitPagination
 
 
@@ -27,6 +30,11 @@ class UserViewSet(viewsets.ModelViewSet):
     permission_classes = [AllowAny]
     pagination_class = LimitPagination
 
+    def get_queryset(self):
+        return with_subscription_flag(
+            super().get_queryset(), self.request.user
+        )
+
     def create(self, request, *args, **kwargs):
         serializer = UserCreateSerializer(data=request.data)
         if serializer.is_valid():
@@ -118,7 +126,25 @@ class SubscriptionsViewSet(viewsets.ModelViewSet):
     pagination_class = LimitPagination
 
     def get_queryset(self):
-        return Follow.objects.filter(user=self.request.user)
+        return Follow.objects.filter(
+            user=self.request.user
+        ).select_related('author').order_by('id')
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        follows = page if page is not None else list(queryset)
+        context = self.get_serializer_context()
+        context['recipe_previews'] = Recipe.objects.previews(
+            [follow.author_id for follow in follows],
+            get_recipes_limit(request)
+        )
+        serializer = self.get_serializer_class()(
+            follows, many=True, context=context
+        )
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
 
 
 class SelfUserViewSet(viewsets.ModelViewSet):
@@ -153,7 +179,8 @@ class SelfUserViewSet(viewsets.ModelViewSet):
             return Response(status=status.HTTP_204_NO_CONTENT)
         if serializer.is_valid():
             user.avatar = serializer.validated_data['avatar']
-            user.save()
+            with transaction.atomic():
+                user.save()
             return Response(
                 self.get_serializer(user).data,
                 status=status.HTTP_200_OK